@@ -0,0 +1,124 @@
+from typing import Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    Response,
+    Security,
+    status,
+)
+
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud_service.crud_categories import AsyncCategoryService
+from crud_service.crud_genres import AsyncGenreService
+from crud_service.crud_versions import (
+    CATEGORIES,
+    GENRES,
+    AsyncVersionService,
+)
+from models.models import User
+from schemas.base import Page
+from schemas.schemas import Category, Genre
+from services.roles import Role
+from services.utils import get_allowed_user_async
+
+router = APIRouter()
+genres_router = APIRouter()
+
+
+@router.post("/", summary="Create the category.", response_model=Category)
+async def create(
+    data_in: Category,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name']],
+    ),
+    service: AsyncCategoryService = Depends(),
+):
+    return await service.create(data_in, user)
+
+
+@router.get(
+    "/", summary="Get list of all categories", response_model=Page[Category]
+)
+async def get_multi(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    service: AsyncCategoryService = Depends(),
+    versions: AsyncVersionService = Depends(),
+):
+    return await versions.cached(
+        request,
+        [CATEGORIES],
+        lambda: service.get_multi(cursor=cursor, limit=limit),
+    )
+
+
+@router.delete(
+    '/{slug}', summary="Delete selected category.", response_class=Response
+)
+async def remove(
+    slug: str,
+    response: Response,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[
+            Role.ADMIN['name'],
+            Role.MODERATOR['name'],
+        ],
+    ),
+    service: AsyncCategoryService = Depends(),
+):
+    response.status_code = status.HTTP_204_NO_CONTENT
+    return await service.remove(slug)
+
+
+@genres_router.post("/", summary="Create the genre.", response_model=Genre)
+async def create_genre(
+    data_in: Genre,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name']],
+    ),
+    service: AsyncGenreService = Depends(),
+):
+    return await service.create(data_in, user)
+
+
+@genres_router.get(
+    "/", summary="Get list of all genres", response_model=Page[Genre]
+)
+async def get_genres(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    service: AsyncGenreService = Depends(),
+    versions: AsyncVersionService = Depends(),
+):
+    return await versions.cached(
+        request,
+        [GENRES],
+        lambda: service.get_multi(cursor=cursor, limit=limit),
+    )
+
+
+@genres_router.delete(
+    '/{slug}', summary="Delete selected genre.", response_class=Response
+)
+async def remove_genre(
+    slug: str,
+    response: Response,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[
+            Role.ADMIN['name'],
+            Role.MODERATOR['name'],
+        ],
+    ),
+    service: AsyncGenreService = Depends(),
+):
+    response.status_code = status.HTTP_204_NO_CONTENT
+    return await service.remove(slug)
@@ -0,0 +1,93 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Security
+
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud_service.crud_comments import AsyncCommentService
+from crud_service.crud_versions import AsyncVersionService, comments_version
+from models.models import User
+from schemas.base import Page
+from schemas.schemas import (
+    CommentIn,
+    CommentOut,
+)
+from schemas.user import (
+    UserSerializer,
+)
+from services.roles import Role
+from services.utils import get_allowed_user_async, get_current_user_async
+
+comments_router = APIRouter()
+
+
+@comments_router.get(
+    '/',
+    summary="Get all comments for the review.",
+    response_model=Page[CommentOut],
+)
+async def get_comments(
+    request: Request,
+    review_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user: UserSerializer = Depends(get_current_user_async),
+    service: AsyncCommentService = Depends(),
+    versions: AsyncVersionService = Depends(),
+):
+    return await versions.cached(
+        request,
+        [comments_version(review_id)],
+        lambda: service.get_multi(
+            cursor=cursor, limit=limit, review_id=review_id
+        ),
+    )
+
+
+@comments_router.post(
+    '/',
+    summary="Create comment to the review.",
+    response_model=CommentOut,
+)
+async def create_comment(
+    review_id: int,
+    data_in: CommentIn,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name'], Role.USER['name']],
+    ),
+    service: AsyncCommentService = Depends(),
+):
+    return await service.create(
+        obj_in=data_in, user=user, review_id=review_id
+    )
+
+
+@comments_router.put(
+    "/{comment_id}",
+    summary="Edit selected comment",
+)
+async def update(
+    comment_id: int,
+    data_in: CommentIn,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name'], Role.USER['name']],
+    ),
+    service: AsyncCommentService = Depends(),
+):
+    return await service.update(data_in, user, comment_id)
+
+
+@comments_router.delete(
+    '/{comment_id}',
+    summary='Delete selected comment.',
+)
+async def delete_comment(
+    comment_id: int,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name'], Role.USER['name']],
+    ),
+    service: AsyncCommentService = Depends(),
+):
+    return await service.remove(id=comment_id)
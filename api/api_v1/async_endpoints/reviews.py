@@ -0,0 +1,114 @@
+from typing import Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    Response,
+    Security,
+    status,
+)
+
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud_service.crud_reviews import AsyncReviewService
+from crud_service.crud_versions import AsyncVersionService, reviews_version
+from models.models import User
+from schemas.base import Page
+from schemas.schemas import (
+    Review,
+    ReviewBase,
+)
+from schemas.user import (
+    UserSerializer,
+)
+from services.roles import Role
+from services.utils import get_allowed_user_async, get_current_user_async
+from .comments import comments_router
+
+reviews_router = APIRouter()
+reviews_router.include_router(
+    comments_router,
+    prefix="/{title_id}/reviews/{review_id}/comments",
+    tags=["comments"],
+)
+
+
+@reviews_router.get(
+    "/{title_id}/reviews/{review_id}",
+    summary="Get review by id.",
+    response_model=Review,
+)
+async def get_review(
+    request: Request,
+    response: Response,
+    title_id: int,
+    review_id: int,
+    user: UserSerializer = Depends(get_current_user_async),
+    service: AsyncReviewService = Depends(),
+    versions: AsyncVersionService = Depends(),
+):
+    response.headers.update(
+        await versions.conditional(request, reviews_version(title_id))
+    )
+    return await service.get_review(title_id, review_id, user)
+
+
+@reviews_router.get(
+    "/{title_id}/reviews",
+    summary="Get all reviews for selected title.",
+    response_model=Page[Review],
+)
+async def get_multi(
+    request: Request,
+    title_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user: UserSerializer = Depends(get_current_user_async),
+    service: AsyncReviewService = Depends(),
+    versions: AsyncVersionService = Depends(),
+):
+    return await versions.cached(
+        request,
+        [reviews_version(title_id)],
+        lambda: service.get_multi(title_id, user, cursor=cursor, limit=limit),
+    )
+
+
+@reviews_router.post(
+    '/{title_id}/reviews',
+    summary="Post review.",
+    response_model=Review,
+    tags=["reviews"],
+)
+async def create_review(
+    title_id: int,
+    data: ReviewBase,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name'], Role.USER["name"]],
+    ),
+    service: AsyncReviewService = Depends(),
+):
+    return await service.create_review(title_id, data, user)
+
+
+@reviews_router.delete(
+    "/{title_id}/reviews/{review_id}",
+    summary="Delete selected review",
+    response_class=Response,
+)
+async def remove(
+    review_id: int,
+    response: Response,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[
+            Role.ADMIN['name'],
+            Role.MODERATOR['name'],
+        ],
+    ),
+    service: AsyncReviewService = Depends(),
+):
+    response.status_code = status.HTTP_204_NO_CONTENT
+    return await service.remove(review_id)
@@ -0,0 +1,125 @@
+from typing import Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    Response,
+    Security,
+    status,
+)
+
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud_service.crud_titles import AsyncTitleService
+from crud_service.crud_versions import (
+    CATEGORIES,
+    TITLES,
+    AsyncVersionService,
+    title_version,
+)
+from models.models import User
+from schemas.base import Page
+from schemas.schemas import Title, TitleBase, TitleFilter, TitleSort
+from schemas.user import (
+    UserSerializer,
+)
+from services.roles import Role
+from services.utils import get_allowed_user_async, get_current_user_async
+from .reviews import reviews_router
+
+router = APIRouter()
+router.include_router(reviews_router, tags=["reviews"])
+
+
+@router.get(
+    '/',
+    summary="Get information about titles.",
+    response_model=Page[Title],
+)
+async def get_titles(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: TitleSort = TitleSort.ID,
+    filters: TitleFilter = Depends(),
+    user: UserSerializer = Depends(get_current_user_async),
+    service: AsyncTitleService = Depends(),
+    versions: AsyncVersionService = Depends(),
+):
+    return await versions.cached(
+        request,
+        [TITLES],
+        lambda: service.get_titles(
+            user=user, cursor=cursor, limit=limit, filters=filters, sort=sort
+        ),
+    )
+
+
+@router.get(
+    '/{title_id}',
+    summary="Get title by id.",
+    response_model=Title,
+)
+async def get_title_by_id(
+    request: Request,
+    title_id: int,
+    user: UserSerializer = Depends(get_current_user_async),
+    service: AsyncTitleService = Depends(),
+    versions: AsyncVersionService = Depends(),
+):
+    return await versions.cached(
+        request,
+        [title_version(title_id), CATEGORIES],
+        lambda: service.get_title_by_id(user=user, title_id=title_id),
+    )
+
+
+@router.post('/', summary="Create title.", response_model=TitleBase)
+async def create_title(
+    data: TitleBase,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name']],
+    ),
+    service: AsyncTitleService = Depends(),
+):
+    return await service.create_title(user=user, data=data)
+
+
+@router.put(
+    '/{title_id}',
+    summary="Edit selected title.",
+    response_model=TitleBase,
+)
+async def edit_title(
+    title_id: int,
+    data: TitleBase,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name']],
+    ),
+    service: AsyncTitleService = Depends(),
+):
+    return await service.edit_title(user=user, title_id=title_id, data=data)
+
+
+@router.delete(
+    '/{title_id}',
+    summary='Delete selected title.',
+    response_class=Response,
+)
+async def delete_title(
+    title_id: int,
+    response: Response,
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[
+            Role.ADMIN['name'],
+            Role.MODERATOR['name'],
+        ],
+    ),
+    service: AsyncTitleService = Depends(),
+):
+    response.status_code = status.HTTP_204_NO_CONTENT
+    return await service.delete_title_by_id(user, title_id)
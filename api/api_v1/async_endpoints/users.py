@@ -0,0 +1,74 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Security
+from fastapi.responses import ORJSONResponse
+
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud_service.crud_users import AsyncUserService
+from models.models import User
+from schemas.base import Page
+from schemas.user import (
+    Roles,
+    UserPatchInput,
+    UserSerializer,
+)
+from services.roles import Role
+from services.utils import get_allowed_user_async, get_current_user_async
+
+router = APIRouter()
+
+
+@router.get("/", summary='Get all users', response_model=Page[UserSerializer])
+async def get_users(
+    roles: Roles or None = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user: User = Security(
+        get_allowed_user_async,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name']],
+    ),
+    service: AsyncUserService = Depends(),
+):
+    return ORJSONResponse(
+        await service.get_list_users(
+            roles=roles, user=user, cursor=cursor, limit=limit
+        )
+    )
+
+
+@router.get(
+    '/me',
+    summary='Get information about logged user.',
+    response_model=UserSerializer,
+)
+async def get_me(user: UserSerializer = Depends(get_current_user_async)):
+    return user
+
+
+@router.put(
+    '/me',
+    summary='Patch information about logged user.',
+    response_model=UserSerializer,
+)
+async def edit_self(
+    user_data: UserPatchInput,
+    user: User = Depends(get_current_user_async),
+    service: AsyncUserService = Depends(),
+):
+    return await service.patch_user(logged_user=user, user_data=user_data)
+
+
+@router.get(
+    '/{username}',
+    summary='Get user by username',
+    response_model=UserSerializer,
+)
+async def get_user_by_username(
+    username: str,
+        user: User = Security(
+        get_allowed_user_async,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name']],
+    ),
+    service: AsyncUserService = Depends(),
+):
+    return await service.get_user(user, username)
@@ -0,0 +1,68 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, Request, Security
+from fastapi.responses import ORJSONResponse
+
+from crud_service.crud_base import MAX_BATCH_SIZE
+from crud_service.crud_reviews import ReviewService
+from crud_service.crud_titles import TitleService
+from crud_service.crud_users import UserService
+from crud_service.crud_versions import CATEGORIES, TITLES, VersionService
+from models.models import User
+from schemas.base import Batch
+from schemas.schemas import Title, TitleReview
+from schemas.user import UserSerializer
+from services.roles import Role
+from services.utils import get_allowed_user, get_current_user
+
+router = APIRouter()
+
+IDS = Query(..., description=f"Up to {MAX_BATCH_SIZE} ids, e.g. ?ids=1&ids=2")
+
+
+@router.get(
+    '/titles',
+    summary="Get many titles by id.",
+    response_model=Batch[Title],
+)
+def get_titles(
+    request: Request,
+    ids: List[int] = IDS,
+    user: UserSerializer = Depends(get_current_user),
+    service: TitleService = Depends(),
+    versions: VersionService = Depends(),
+):
+    return versions.cached(
+        request,
+        [TITLES, CATEGORIES],
+        lambda: service.get_titles_by_ids(user, ids),
+    )
+
+
+@router.get(
+    '/reviews',
+    summary="Get many reviews by id.",
+    response_model=Batch[TitleReview],
+)
+def get_reviews(
+    ids: List[int] = IDS,
+    user: UserSerializer = Depends(get_current_user),
+    service: ReviewService = Depends(),
+):
+    return ORJSONResponse(service.get_reviews_by_ids(user, ids))
+
+
+@router.get(
+    '/users',
+    summary="Get many users by id.",
+    response_model=Batch[UserSerializer],
+)
+def get_users(
+    ids: List[int] = IDS,
+    user: User = Security(
+        get_allowed_user,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name']],
+    ),
+    service: UserService = Depends(),
+):
+    return ORJSONResponse(service.get_users_by_ids(user, ids))
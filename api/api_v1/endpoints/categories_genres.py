@@ -1,15 +1,32 @@
-from typing import List
+from typing import Optional
 
 # from services.crud_service import CategoryService, UserService, TitleService
-from fastapi import APIRouter, Depends, Response, status, Security
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    Response,
+    Security,
+    status,
+)
 
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from crud_service.crud_categories import CategoryService
+from crud_service.crud_genres import GenreService
+from crud_service.crud_versions import (
+    CATEGORIES,
+    GENRES,
+    VersionService,
+)
 from models.models import User
-from schemas.schemas import Category
+from schemas.base import Page
+from schemas.schemas import Category, Genre
 from services.roles import Role
 from services.utils import get_allowed_user
 
 router = APIRouter()
+genres_router = APIRouter()
 
 
 @router.post("/", summary="Create the category.", response_model=Category)
@@ -25,12 +42,20 @@ def create(
 
 
 @router.get(
-    "/", summary="Get list of all categories", response_model=List[Category]
+    "/", summary="Get list of all categories", response_model=Page[Category]
 )
 def get_multi(
-    skip: int = 0, limit: int = 100, service: CategoryService = Depends()
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    service: CategoryService = Depends(),
+    versions: VersionService = Depends(),
 ):
-    return service.get_multi(skip=skip, limit=limit)
+    return versions.cached(
+        request,
+        [CATEGORIES],
+        lambda: service.get_multi(cursor=cursor, limit=limit),
+    )
 
 
 @router.delete(
@@ -50,3 +75,51 @@ def remove(
 ):
     response.status_code = status.HTTP_204_NO_CONTENT
     return service.remove(slug)
+
+
+@genres_router.post("/", summary="Create the genre.", response_model=Genre)
+def create_genre(
+    data_in: Genre,
+    user: User = Security(
+        get_allowed_user,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name']],
+    ),
+    service: GenreService = Depends(),
+):
+    return service.create(data_in, user)
+
+
+@genres_router.get(
+    "/", summary="Get list of all genres", response_model=Page[Genre]
+)
+def get_genres(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    service: GenreService = Depends(),
+    versions: VersionService = Depends(),
+):
+    return versions.cached(
+        request,
+        [GENRES],
+        lambda: service.get_multi(cursor=cursor, limit=limit),
+    )
+
+
+@genres_router.delete(
+    '/{slug}', summary="Delete selected genre.", response_class=Response
+)
+def remove_genre(
+    slug: str,
+    response: Response,
+    user: User = Security(
+        get_allowed_user,
+        scopes=[
+            Role.ADMIN['name'],
+            Role.MODERATOR['name'],
+        ],
+    ),
+    service: GenreService = Depends(),
+):
+    response.status_code = status.HTTP_204_NO_CONTENT
+    return service.remove(slug)
@@ -1,9 +1,12 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Security
+from fastapi import APIRouter, Depends, Query, Request, Security
 
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from crud_service.crud_comments import CommentService
+from crud_service.crud_versions import VersionService, comments_version
 from models.models import User
+from schemas.base import Page
 from schemas.schemas import (
     CommentIn,
     CommentOut,
@@ -20,16 +23,24 @@ comments_router = APIRouter()
 @comments_router.get(
     '/',
     summary="Get all comments for the review.",
-    response_model=List[CommentOut],
+    response_model=Page[CommentOut],
 )
 def get_comments(
+    request: Request,
     review_id: int,
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     user: UserSerializer = Depends(get_current_user),
     service: CommentService = Depends(),
+    versions: VersionService = Depends(),
 ):
-    return service.get_multi(skip=skip, limit=limit, review_id=review_id)
+    return versions.cached(
+        request,
+        [comments_version(review_id)],
+        lambda: service.get_multi(
+            cursor=cursor, limit=limit, review_id=review_id
+        ),
+    )
 
 
 @comments_router.post(
@@ -0,0 +1,75 @@
+from enum import Enum
+from typing import Iterator, List, Optional
+
+import orjson
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from crud_service.crud_export import ExportService
+from schemas.user import UserSerializer
+from services.utils import get_current_user
+
+router = APIRouter()
+
+
+class ExportFormat(str, Enum):
+    NDJSON = 'ndjson'
+    JSON = 'json'
+
+
+def ndjson_chunks(batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b''.join(orjson.dumps(row) + b'\n' for row in batch)
+
+
+def json_array_chunks(batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    yield b'['
+    separator = b''
+    for batch in batches:
+        if batch:
+            yield separator + b','.join(orjson.dumps(row) for row in batch)
+            separator = b','
+    yield b']'
+
+
+def stream(
+    batches: Iterator[List[dict]], export_format: ExportFormat
+) -> StreamingResponse:
+    if export_format == ExportFormat.JSON:
+        return StreamingResponse(
+            json_array_chunks(batches), media_type='application/json'
+        )
+    return StreamingResponse(
+        ndjson_chunks(batches), media_type='application/x-ndjson'
+    )
+
+
+@router.get('/titles', summary="Stream all titles.")
+def export_titles(
+    format: ExportFormat = ExportFormat.NDJSON,
+    user: UserSerializer = Depends(get_current_user),
+    service: ExportService = Depends(),
+):
+    return stream(service.titles(), format)
+
+
+@router.get('/reviews', summary="Stream all reviews, optionally of a title.")
+def export_reviews(
+    title_id: Optional[int] = None,
+    format: ExportFormat = ExportFormat.NDJSON,
+    user: UserSerializer = Depends(get_current_user),
+    service: ExportService = Depends(),
+):
+    return stream(service.reviews(title_id), format)
+
+
+@router.get(
+    '/comments', summary="Stream all comments, optionally of a review."
+)
+def export_comments(
+    review_id: Optional[int] = None,
+    format: ExportFormat = ExportFormat.NDJSON,
+    user: UserSerializer = Depends(get_current_user),
+    service: ExportService = Depends(),
+):
+    return stream(service.comments(review_id), format)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, File, Security, UploadFile
+
+from crud_service.crud_import import (
+    ImportFormat,
+    ImportKind,
+    ImportService,
+    read_rows,
+)
+from models.models import User
+from schemas.imports import ImportReport
+from services.roles import Role
+from services.utils import get_allowed_user
+
+router = APIRouter()
+
+
+@router.post(
+    '/{kind}',
+    summary="Bulk import records from an NDJSON, JSON or CSV file.",
+    response_model=ImportReport,
+)
+def import_records(
+    kind: ImportKind,
+    format: ImportFormat = ImportFormat.NDJSON,
+    file: UploadFile = File(...),
+    user: User = Security(
+        get_allowed_user,
+        scopes=[Role.ADMIN['name'], Role.MODERATOR['name']],
+    ),
+    service: ImportService = Depends(),
+):
+    return service.import_rows(kind, read_rows(file.file, format))
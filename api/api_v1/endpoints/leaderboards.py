@@ -0,0 +1,53 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from crud_service.crud_leaderboards import (
+    DEFAULT_LEADERBOARD_SIZE,
+    MAX_LEADERBOARD_SIZE,
+    LeaderboardKind,
+    LeaderboardService,
+    activity_version,
+)
+from crud_service.crud_ratings import week_start
+from crud_service.crud_versions import CATEGORIES, TITLES, VersionService
+from schemas.leaderboards import Leaderboard
+from schemas.user import UserSerializer
+from services.utils import get_current_user
+
+router = APIRouter()
+
+
+@router.get(
+    '/{kind}',
+    summary="Top titles by rating, review count or reviews of a week.",
+    response_model=Leaderboard,
+)
+def get_leaderboard(
+    request: Request,
+    kind: LeaderboardKind,
+    category: Optional[str] = None,
+    limit: int = Query(
+        DEFAULT_LEADERBOARD_SIZE, ge=1, le=MAX_LEADERBOARD_SIZE
+    ),
+    week: Optional[date] = Query(
+        None, description="Any day of the week, the current one by default."
+    ),
+    user: UserSerializer = Depends(get_current_user),
+    service: LeaderboardService = Depends(),
+    versions: VersionService = Depends(),
+):
+    names = [TITLES, CATEGORIES]
+    key_suffix = ''
+    if kind is LeaderboardKind.WEEKLY:
+        # without ?week= the URL stays the same when a new week starts
+        week = week_start(week or date.today())
+        names.append(activity_version(week))
+        key_suffix = f'#week={week.isoformat()}'
+    return versions.cached(
+        request,
+        names,
+        lambda: service.top(kind, category=category, limit=limit, week=week),
+        key_suffix,
+    )
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Security
+
+from models.pools import pool_stats
+from schemas.user import UserPrincipal
+from services.roles import Role
+from services.utils import get_allowed_user
+
+router = APIRouter()
+
+
+@router.get(
+    '/pools',
+    summary="Connection pool usage, to size the pools and workers.",
+)
+def get_pool_stats(
+    user: UserPrincipal = Security(
+        get_allowed_user, scopes=[Role.ADMIN['name']]
+    ),
+):
+    return pool_stats()
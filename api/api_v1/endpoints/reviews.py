@@ -1,9 +1,20 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Response, status, Security
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    Response,
+    Security,
+    status,
+)
 
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from crud_service.crud_reviews import ReviewService
+from crud_service.crud_versions import VersionService, reviews_version
 from models.models import User
+from schemas.base import Page
 from schemas.schemas import (
     Review,
     ReviewBase,
@@ -29,25 +40,39 @@ reviews_router.include_router(
     response_model=Review,
 )
 def get_review(
+    request: Request,
+    response: Response,
     title_id: int,
     review_id: int,
     user: UserSerializer = Depends(get_current_user),
     service: ReviewService = Depends(),
+    versions: VersionService = Depends(),
 ):
+    response.headers.update(
+        versions.conditional(request, reviews_version(title_id))
+    )
     return service.get_review(title_id, review_id, user)
 
 
 @reviews_router.get(
     "/{title_id}/reviews",
     summary="Get all reviews for selected title.",
-    response_model=List[Review],
+    response_model=Page[Review],
 )
 def get_multi(
+    request: Request,
     title_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     user: UserSerializer = Depends(get_current_user),
     service: ReviewService = Depends(),
+    versions: VersionService = Depends(),
 ):
-    return service.get_multi(title_id, user)
+    return versions.cached(
+        request,
+        [reviews_version(title_id)],
+        lambda: service.get_multi(title_id, user, cursor=cursor, limit=limit),
+    )
 
 
 @reviews_router.post(
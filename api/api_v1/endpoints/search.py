@@ -0,0 +1,31 @@
+from typing import Optional, Union
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from crud_service.crud_search import SearchKind, SearchService
+from schemas.base import Page
+from schemas.search import CommentHit, ReviewHit, TitleHit
+from schemas.user import UserSerializer
+from services.utils import get_current_user
+
+router = APIRouter()
+
+
+@router.get(
+    '/',
+    summary="Full-text search of titles, reviews or comments.",
+    response_model=Page[Union[TitleHit, ReviewHit, CommentHit]],
+)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: SearchKind = SearchKind.TITLES,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user: UserSerializer = Depends(get_current_user),
+    service: SearchService = Depends(),
+):
+    return ORJSONResponse(
+        service.search(kind, q, cursor=cursor, limit=limit)
+    )
@@ -1,10 +1,26 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Response, status, Security
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    Response,
+    Security,
+    status,
+)
 
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from crud_service.crud_titles import TitleService
+from crud_service.crud_versions import (
+    CATEGORIES,
+    TITLES,
+    VersionService,
+    title_version,
+)
 from models.models import User
-from schemas.schemas import TitleBase, Title
+from schemas.base import Page
+from schemas.schemas import Title, TitleBase, TitleFilter, TitleSort
 from schemas.user import (
     UserSerializer,
 )
@@ -19,13 +35,25 @@ router.include_router(reviews_router, tags=["reviews"])
 @router.get(
     '/',
     summary="Get information about titles.",
-    response_model=List[Title],
+    response_model=Page[Title],
 )
 def get_titles(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    sort: TitleSort = TitleSort.ID,
+    filters: TitleFilter = Depends(),
     user: UserSerializer = Depends(get_current_user),
     service: TitleService = Depends(),
+    versions: VersionService = Depends(),
 ):
-    return service.get_titles(user=user)
+    return versions.cached(
+        request,
+        [TITLES],
+        lambda: service.get_titles(
+            user=user, cursor=cursor, limit=limit, filters=filters, sort=sort
+        ),
+    )
 
 
 @router.get(
@@ -34,11 +62,17 @@ def get_titles(
     response_model=Title,
 )
 def get_title_by_id(
+    request: Request,
     title_id: int,
     user: UserSerializer = Depends(get_current_user),
     service: TitleService = Depends(),
+    versions: VersionService = Depends(),
 ):
-    return service.get_title_by_id(user=user, title_id=title_id)
+    return versions.cached(
+        request,
+        [title_version(title_id), CATEGORIES],
+        lambda: service.get_title_by_id(user=user, title_id=title_id),
+    )
 
 
 @router.post('/', summary="Create title.", response_model=TitleBase)
@@ -1,9 +1,12 @@
-from typing import List
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Security
+from fastapi import APIRouter, Depends, Query, Security
+from fastapi.responses import ORJSONResponse
 
+from crud_service.crud_base import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from crud_service.crud_users import UserService
 from models.models import User
+from schemas.base import Page
 from schemas.user import (
     Roles,
     UserPatchInput,
@@ -15,17 +18,22 @@ from services.utils import get_current_user, get_allowed_user
 router = APIRouter()
 
 
-@router.get("/", summary='Get all users', response_model=List[UserSerializer])
+@router.get("/", summary='Get all users', response_model=Page[UserSerializer])
 def get_users(
     roles: Roles or None = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     user: User = Security(
         get_allowed_user,
         scopes=[Role.ADMIN['name'], Role.MODERATOR['name']],
     ),
     service: UserService = Depends(),
 ):
-    
-    return service.get_list_users(roles=roles, user=user)
+    return ORJSONResponse(
+        service.get_list_users(
+            roles=roles, user=user, cursor=cursor, limit=limit
+        )
+    )
 
 
 @router.get(
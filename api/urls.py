@@ -1,6 +1,20 @@
 from fastapi import APIRouter
 
-from api.api_v1.endpoints import categories_genres, login, titles, users
+from api.api_v1.endpoints import (
+    batch,
+    export,
+    imports,
+    leaderboards,
+    login,
+    metrics,
+    search,
+)
+from services.config import settings
+
+if settings.async_mode:
+    from api.api_v1.async_endpoints import categories_genres, titles, users
+else:
+    from api.api_v1.endpoints import categories_genres, titles, users
 
 api_router = APIRouter(prefix='/api/v1')
 api_router.include_router(login.router, tags=["login"])
@@ -9,3 +23,14 @@ api_router.include_router(titles.router, prefix="/titles", tags=["titles"])
 api_router.include_router(
     categories_genres.router, prefix="/categories", tags=["categories"]
 )
+api_router.include_router(
+    categories_genres.genres_router, prefix="/genres", tags=["genres"]
+)
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(imports.router, prefix="/import", tags=["import"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(
+    leaderboards.router, prefix="/leaderboards", tags=["leaderboards"]
+)
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
@@ -0,0 +1,51 @@
+"""
+Per-request cost of the auth dependency with cold and warm caches.
+
+Cold clears the token and user caches before every call, which is what
+each request paid before they existed. Run from the repository root:
+
+    PYTHONPATH=services python -m benchmarks.auth_overhead
+"""
+import time
+
+from benchmarks.common import memory_engine, new_session, seed_catalogue
+from services.utils import (
+    create_access_token,
+    get_current_user,
+    token_cache,
+    user_cache,
+)
+
+CALLS = 2_000
+
+
+def per_call_us(func, calls: int = CALLS) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main():
+    engine = memory_engine()
+    seed_catalogue(engine, titles=1)
+    session = new_session(engine)
+    token = create_access_token({'id': '1', 'role': 'user'})
+
+    def cold():
+        token_cache.clear()
+        user_cache.clear()
+        get_current_user(token=token, session=session)
+        session.expunge_all()
+
+    def warm():
+        get_current_user(token=token, session=session)
+
+    print(f'cold  {per_call_us(cold):8.1f} us/request')
+    print(f'warm  {per_call_us(warm):8.1f} us/request')
+    print(f'token cache {token_cache.stats()}')
+    print(f'user cache  {user_cache.stats()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Query count of a review and comment page as the number of authors grows.
+
+Run from the repository root:
+
+    python -m benchmarks.comments_query_count
+"""
+from sqlalchemy import insert
+
+from benchmarks.common import count_queries, memory_engine, new_session
+from crud_service.crud_base import MAX_PAGE_SIZE
+from crud_service.crud_comments import CommentService
+from crud_service.crud_reviews import ReviewService
+from models import models
+
+SIZES = (10, 100, MAX_PAGE_SIZE)
+
+
+def seed(engine, size: int):
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.User),
+            [{'id': i, 'username': f'user{i}'} for i in range(1, size + 1)],
+        )
+        conn.execute(insert(models.Title), [{'id': 1, 'name': 'T', 'year': 1}])
+        conn.execute(
+            insert(models.Review),
+            [
+                {'id': i, 'title_id': 1, 'author_id': i, 'score': 5}
+                for i in range(1, size + 1)
+            ],
+        )
+        conn.execute(
+            insert(models.Comment),
+            [
+                {'review_id': 1, 'author_id': i, 'text': 'comment'}
+                for i in range(1, size + 1)
+            ],
+        )
+
+
+def main():
+    print(f"{'rows':>8} {'review queries':>15} {'comment queries':>16}")
+    for size in SIZES:
+        engine = memory_engine()
+        seed(engine, size)
+        session = new_session(engine)
+        with count_queries(engine) as reviews:
+            ReviewService(session=session).get_multi(1, None, limit=size)
+        session.expunge_all()
+        with count_queries(engine) as comments:
+            CommentService(session=session).get_multi(1, limit=size)
+        print(f"{size:>8} {reviews['queries']:>15} {comments['queries']:>16}")
+        session.close()
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
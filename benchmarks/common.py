@@ -0,0 +1,97 @@
+import os
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault('JWT_SECRET_KEY', 'benchmark')
+os.environ.setdefault('JWT_REFRESH_SECRET_KEY', 'benchmark')
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from models import models  # noqa: E402
+
+
+def memory_engine():
+    """
+    Fresh in-memory sqlite engine with the application schema.
+    """
+    engine = create_engine(
+        'sqlite://',
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    models.Base.metadata.create_all(engine)
+    return engine
+
+
+def seed_catalogue(engine, titles: int, reviews_per_title: int = 3):
+    """
+    Bulk insert a category, one author and `titles` titles with reviews.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.Category), [{'id': 1, 'name': 'Movie', 'slug': 'movie'}]
+        )
+        conn.execute(
+            insert(models.User),
+            [{'id': 1, 'username': 'bench', 'email': 'bench@example.com'}],
+        )
+        if titles:
+            conn.execute(
+                insert(models.Title),
+                [
+                    {
+                        'id': i,
+                        'name': f'Title {i}',
+                        'year': 1900 + i % 120,
+                        'category_id': 1,
+                    }
+                    for i in range(1, titles + 1)
+                ],
+            )
+        reviews = [
+            {
+                'title_id': i,
+                'author_id': 1,
+                'text': 'text',
+                'score': (i + j) % 10 + 1,
+            }
+            for i in range(1, titles + 1)
+            for j in range(reviews_per_title)
+        ]
+        if reviews:
+            conn.execute(insert(models.Review), reviews)
+
+
+@contextmanager
+def count_queries(engine):
+    """
+    Count statements sent to `engine` inside the block.
+    """
+    counter = {'queries': 0}
+
+    def before_cursor_execute(*args):
+        counter['queries'] += 1
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def timed(func, *args, repeat: int = 5, **kwargs) -> float:
+    """
+    Best wall time in milliseconds over `repeat` calls.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def new_session(engine) -> Session:
+    return Session(bind=engine, autocommit=False, autoflush=False)
@@ -0,0 +1,120 @@
+"""
+Review posting and title reads from concurrent threads on a file database,
+with sqlite's defaults (rollback journal) versus the tuned connection
+pragmas of the settings (WAL, synchronous=NORMAL, busy timeout, mmap...).
+
+Writers post reviews through ReviewService, readers page through titles
+and reviews, every operation in its own session as in a request. Run from
+the repository root, optionally with the duration in seconds and the
+number of writer and reader threads:
+
+    python -m benchmarks.concurrent_reviews 5 4 8
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, exc
+
+from benchmarks.common import new_session, seed_catalogue
+from crud_service.crud_reviews import ReviewService
+from crud_service.crud_titles import TitleService
+from models import models
+from models.database import configure_sqlite, sqlite_pragmas
+from schemas.schemas import ReviewBase
+
+TITLES = 1_000
+# fsync costs depend on the filesystem, /tmp is often in memory
+BENCH_DIR = os.environ.get('BENCH_DIR', '.')
+
+
+def file_engine(path: str, pragmas: dict):
+    engine = create_engine(
+        f'sqlite:///{path}',
+        connect_args={"check_same_thread": False},
+    )
+    configure_sqlite(engine, pragmas)
+    models.Base.metadata.create_all(engine)
+    return engine
+
+
+def run(engine, duration: float, writers: int, readers: int) -> dict:
+    author = SimpleNamespace(id=1, username='bench')
+    counts = {'writes': 0, 'reads': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def count(key: str):
+        with lock:
+            counts[key] += 1
+
+    def write(worker: int):
+        title_id = worker + 1
+        while time.perf_counter() < deadline:
+            session = new_session(engine)
+            try:
+                ReviewService(session=session).create_review(
+                    title_id % TITLES + 1,
+                    ReviewBase(text='concurrent review text', score=7),
+                    author,
+                )
+                count('writes')
+            except exc.OperationalError:
+                session.rollback()
+                count('errors')
+            finally:
+                session.close()
+            title_id += writers
+
+    def read(worker: int):
+        while time.perf_counter() < deadline:
+            session = new_session(engine)
+            try:
+                TitleService(session=session).get_titles(None, limit=50)
+                ReviewService(session=session).get_multi(
+                    worker % TITLES + 1, None, limit=50
+                )
+                count('reads')
+            except exc.OperationalError:
+                session.rollback()
+                count('errors')
+            finally:
+                session.close()
+
+    threads = [
+        threading.Thread(target=write, args=(i,)) for i in range(writers)
+    ] + [threading.Thread(target=read, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    print(f'{writers} writers, {readers} readers, {duration:g} s each')
+    profiles = {
+        'defaults': {},
+        'tuned': sqlite_pragmas(),
+    }
+    for name, pragmas in profiles.items():
+        with tempfile.TemporaryDirectory(dir=BENCH_DIR) as directory:
+            engine = file_engine(os.path.join(directory, 'bench.db'), pragmas)
+            seed_catalogue(engine, TITLES, reviews_per_title=5)
+            counts = run(engine, duration, writers, readers)
+            engine.dispose()
+        print(
+            f'{name:>9}: {counts["writes"] / duration:8.1f} writes/s, '
+            f'{counts["reads"] / duration:8.1f} reads/s, '
+            f'{counts["errors"]} locked errors'
+        )
+
+
+if __name__ == '__main__':
+    main()
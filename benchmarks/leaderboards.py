@@ -0,0 +1,78 @@
+"""
+Top 100 titles by rating and by reviews of the current week, computed on
+demand from the reviews versus read from the stored aggregates and the
+weekly activity buckets. Run from the repository root, optionally with the
+number of titles:
+
+    python -m benchmarks.leaderboards 20000
+"""
+import sys
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select, update
+
+from benchmarks.common import memory_engine, new_session, seed_catalogue
+from benchmarks.common import timed
+from crud_service.crud_leaderboards import LeaderboardKind, LeaderboardService
+from crud_service.crud_ratings import (
+    rebuild_title_activity,
+    rebuild_title_ratings,
+    week_start,
+)
+from models import models
+
+TOP = 100
+REVIEWS_PER_TITLE = 10
+
+
+def spread_reviews(engine):
+    # reviews of a title spread over the last REVIEWS_PER_TITLE days
+    review = models.Review
+    with engine.begin() as conn:
+        conn.execute(
+            update(review).values(
+                pub_date=func.datetime(
+                    datetime.now() - timedelta(days=REVIEWS_PER_TITLE - 1),
+                    func.printf('+%d days', review.id % REVIEWS_PER_TITLE),
+                )
+            )
+        )
+
+
+def on_demand(session, kind: LeaderboardKind):
+    review = models.Review
+    stmt = select(review.title_id).group_by(review.title_id)
+    if kind is LeaderboardKind.RATING:
+        order = func.avg(review.score)
+    else:
+        since = datetime.combine(week_start(date.today()), datetime.min.time())
+        stmt = stmt.where(review.pub_date >= since)
+        order = func.count(review.id)
+    stmt = stmt.order_by(order.desc(), review.title_id.desc()).limit(TOP)
+    return session.execute(stmt).scalars().all()
+
+
+def main():
+    titles = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    engine = memory_engine()
+    seed_catalogue(engine, titles, REVIEWS_PER_TITLE)
+    spread_reviews(engine)
+    session = new_session(engine)
+    rebuild_title_ratings(session)
+    rebuild_title_activity(session)
+    service = LeaderboardService(session=session)
+
+    print(f'{titles} titles, {titles * REVIEWS_PER_TITLE} reviews, top {TOP}')
+    for kind in (LeaderboardKind.RATING, LeaderboardKind.WEEKLY):
+        stored = service.top(kind, limit=TOP)['results']
+        assert [row['id'] for row in stored] == on_demand(session, kind)
+        demand_ms = timed(on_demand, session, kind)
+        stored_ms = timed(service.top, kind, limit=TOP)
+        print(
+            f'{kind.value:>9}: on demand {demand_ms:8.2f} ms, '
+            f'stored {stored_ms:6.2f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
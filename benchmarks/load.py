@@ -0,0 +1,76 @@
+"""
+Concurrent load against a running server, to compare the sync and async modes.
+
+Start the server in each mode and point the benchmark at it:
+
+    ASYNC_MODE=0 uvicorn app:app --workers 1
+    python -m benchmarks.load --token <jwt> --concurrency 200
+
+    ASYNC_MODE=1 uvicorn app:app --workers 1
+    python -m benchmarks.load --token <jwt> --concurrency 200
+
+Requires httpx (`pip install httpx`).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    raise SystemExit('benchmarks.load requires httpx: pip install httpx')
+
+
+async def worker(client, path, headers, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(args):
+    headers = {'Authorization': f'Bearer {args.token}'}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    latencies, errors = [], []
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=args.timeout
+    ) as client:
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            *(
+                worker(client, args.path, headers, deadline, latencies, errors)
+                for _ in range(args.concurrency)
+            )
+        )
+    if not latencies:
+        print(f'no successful requests, errors: {errors[:10]}')
+        return
+    latencies.sort()
+    print(f'requests     {len(latencies)}')
+    print(f'errors       {len(errors)}')
+    print(f'req/s        {len(latencies) / args.duration:.1f}')
+    print(f'p50 ms       {statistics.median(latencies) * 1000:.1f}')
+    print(f'p99 ms       {latencies[int(len(latencies) * 0.99)] * 1000:.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--path', default='/api/v1/titles/')
+    parser.add_argument('--token', required=True)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Latency of the hot lookups with and without their indexes.
+
+Seeds `rows` users and reviews (1M by default) in an in-memory database and
+times the username and review-by-title lookups the services issue, then drops
+the indexes and times them again. Run from the repository root:
+
+    python -m benchmarks.lookup_latency [rows]
+"""
+import random
+import sys
+import time
+
+from sqlalchemy import insert, select, text
+
+from benchmarks.common import memory_engine
+from models import models
+
+BATCH = 50_000
+
+
+def seed(engine, rows: int):
+    with engine.begin() as conn:
+        for start in range(0, rows, BATCH):
+            stop = min(start + BATCH, rows)
+            conn.execute(
+                insert(models.User),
+                [{'id': i, 'username': f'user{i}'} for i in range(start, stop)],
+            )
+            conn.execute(
+                insert(models.Review),
+                [
+                    {'title_id': i % 10_000, 'author_id': i, 'score': 5}
+                    for i in range(start, stop)
+                ],
+            )
+
+
+def lookup_us(engine, stmt, params, calls: int) -> float:
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        for value in params[:calls]:
+            conn.execute(stmt, value).all()
+        return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    engine = memory_engine()
+    seed(engine, rows)
+    by_username = select(models.User.id).where(
+        models.User.username == text(':username')
+    )
+    by_title = select(models.Review.id).where(
+        models.Review.title_id == text(':title_id')
+    )
+    usernames = [
+        {'username': f'user{random.randrange(rows)}'} for _ in range(1_000)
+    ]
+    titles = [{'title_id': random.randrange(10_000)} for _ in range(1_000)]
+
+    print(f'{rows} rows')
+    print(f"{'lookup':<22}{'indexed us':>12}{'scan us':>12}")
+    indexed = (
+        lookup_us(engine, by_username, usernames, 1_000),
+        lookup_us(engine, by_title, titles, 1_000),
+    )
+    with engine.begin() as conn:
+        conn.execute(text('DROP INDEX ix_user_username'))
+        conn.execute(text('DROP INDEX ix_review_title_id_pub_date'))
+    scanned = (
+        lookup_us(engine, by_username, usernames, 20),
+        lookup_us(engine, by_title, titles, 20),
+    )
+    for name, fast, slow in zip(
+        ('user.username', 'review.title_id'), indexed, scanned
+    ):
+        print(f'{name:<22}{fast:>12.1f}{slow:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Cost of recording a request in the metrics, and of a scrape, as the
+number of routes grows.
+
+Run from the repository root:
+
+    PYTHONPATH=services python -m benchmarks.metrics_overhead
+"""
+import time
+
+from benchmarks.common import timed
+from services.metrics import RequestMetrics, render
+
+OBSERVATIONS = 100_000
+ROUTES = (10, 100, 1_000)
+
+
+def main():
+    print(f"{'routes':>8} {'observe us':>11} {'scrape ms':>10}")
+    for routes in ROUTES:
+        metrics = RequestMetrics()
+        shard = metrics.shard()
+        start = time.perf_counter()
+        for i in range(OBSERVATIONS):
+            metrics.observe(
+                shard, 'GET', f'/route/{i % routes}', 200, (i % 100) / 1000
+            )
+        observe = (time.perf_counter() - start) / OBSERVATIONS * 1e6
+        scrape = timed(render, metrics)
+        print(f"{routes:>8} {observe:>11.2f} {scrape:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Cost of a title listing page with a cold and a warm response cache.
+
+Cold clears the cache before every call and pays the version lookup, the
+listing query and rendering; warm is answered from the cache without
+touching the database. Run from the repository root:
+
+    python -m benchmarks.response_cache
+"""
+from starlette.requests import Request
+
+from benchmarks.common import (
+    count_queries,
+    memory_engine,
+    new_session,
+    seed_catalogue,
+    timed,
+)
+from crud_service.crud_titles import TitleService
+from crud_service.crud_versions import TITLES, VersionService
+from services.response_cache import response_cache
+
+CALLS = 200
+
+
+def listing_request() -> Request:
+    return Request(
+        {
+            'type': 'http',
+            'method': 'GET',
+            'path': '/api/v1/titles/',
+            'query_string': b'limit=100',
+            'headers': [],
+        }
+    )
+
+
+def main():
+    engine = memory_engine()
+    seed_catalogue(engine, titles=1_000)
+    session = new_session(engine)
+    service = TitleService(session=session)
+    versions = VersionService(session=session)
+    request = listing_request()
+
+    def page():
+        return versions.cached(
+            request, [TITLES], lambda: service.get_titles(user=None, limit=100)
+        )
+
+    def cold():
+        for _ in range(CALLS):
+            response_cache.clear()
+            page()
+
+    def warm():
+        for _ in range(CALLS):
+            page()
+
+    page()
+    with count_queries(engine) as counter:
+        page()
+    print(f'cold {timed(cold) / CALLS * 1000:8.1f} us/page')
+    print(
+        f'warm {timed(warm) / CALLS * 1000:8.1f} us/page, '
+        f'{counter["queries"]} queries'
+    )
+    print(f'cache {response_cache.stats()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Latency of ranked review search as the review table grows.
+
+Reviews are random sentences over a fixed vocabulary, so rare words hit a
+handful of rows and common ones a large share of the table. Run from the
+repository root, optionally with the number of reviews:
+
+    python -m benchmarks.search 1000000
+"""
+import random
+import sys
+
+from sqlalchemy import insert, select
+
+from benchmarks.common import memory_engine, new_session, seed_catalogue
+from benchmarks.common import timed
+from crud_service.crud_search import SearchKind, SearchService
+from models import models
+from models.search import review_search
+
+VOCABULARY = [f'word{i}' for i in range(20_000)]
+WORDS_PER_REVIEW = 20
+BATCH = 50_000
+
+
+def seed_reviews(engine, count: int):
+    rng = random.Random(0)
+    # zipf-like: low numbered words are far more frequent
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+    with engine.begin() as conn:
+        for start in range(0, count, BATCH):
+            conn.execute(
+                insert(models.Review),
+                [
+                    {
+                        'title_id': 1,
+                        'author_id': 1,
+                        'score': rng.randint(1, 10),
+                        'text': ' '.join(
+                            rng.choices(
+                                VOCABULARY, weights, k=WORDS_PER_REVIEW
+                            )
+                        ),
+                    }
+                    for _ in range(min(BATCH, count - start))
+                ],
+            )
+        conn.execute(
+            insert(review_search).from_select(
+                ['rowid', 'text'],
+                select(models.Review.id, models.Review.text),
+            )
+        )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    engine = memory_engine()
+    seed_catalogue(engine, titles=1, reviews_per_title=0)
+    seed_reviews(engine, count)
+    service = SearchService(session=new_session(engine))
+    print(f'{count} reviews')
+    for query in ('word19999', 'word500', 'word5 word7', 'word1', 'word12*'):
+        best = timed(service.search, SearchKind.REVIEWS, query, limit=20)
+        print(f'{query:<14} {best:8.2f} ms/page')
+
+
+if __name__ == '__main__':
+    main()
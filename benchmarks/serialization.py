@@ -0,0 +1,59 @@
+"""
+Cost of turning a page of reviews into a response body.
+
+`before` replays the previous path: jsonable_encoder on every row, a Review
+model per row, validation against the Page[Review] response model, a
+second jsonable_encoder and stdlib json. `after` is the fast path: the
+service rows are dumped once with orjson. Run from the repository root:
+
+    python -m benchmarks.serialization
+"""
+import json
+from datetime import datetime
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.common import timed
+from crud_service.crud_base import MAX_PAGE_SIZE
+from schemas.base import Page
+from schemas.schemas import Review
+
+ROWS = (10, 100, MAX_PAGE_SIZE)
+
+
+def rows(count: int) -> list:
+    return [
+        {
+            'id': i,
+            'text': 'A fairly ordinary review text ' * 4,
+            'score': i % 10 + 1,
+            'pub_date': datetime(2022, 1, 1, 12, 0, i % 60),
+            'author': f'user{i}',
+        }
+        for i in range(count)
+    ]
+
+
+def before(page: dict) -> bytes:
+    results = [Review(**jsonable_encoder(row)) for row in page['results']]
+    model = Page[Review](results=results, next_cursor=page['next_cursor'])
+    return json.dumps(jsonable_encoder(model)).encode()
+
+
+def after(page: dict) -> bytes:
+    return orjson.dumps(page)
+
+
+def main():
+    print(f"{'rows':>6} {'before ms':>10} {'after ms':>10}")
+    for count in ROWS:
+        page = {'results': rows(count), 'next_cursor': 'WzFd'}
+        print(
+            f'{count:>6} {timed(before, page, repeat=20):>10.3f} '
+            f'{timed(after, page, repeat=20):>10.3f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
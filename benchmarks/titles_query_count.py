@@ -0,0 +1,36 @@
+"""
+Query count and latency of `TitleService.get_titles` as the catalogue grows.
+
+Run from the repository root:
+
+    python -m benchmarks.titles_query_count
+"""
+from benchmarks.common import (
+    count_queries,
+    memory_engine,
+    new_session,
+    seed_catalogue,
+    timed,
+)
+from crud_service.crud_titles import TitleService
+
+SIZES = (10, 100, 1_000, 10_000)
+
+
+def main():
+    print(f"{'titles':>8} {'queries':>8} {'ms':>10}")
+    for size in SIZES:
+        engine = memory_engine()
+        seed_catalogue(engine, titles=size)
+        session = new_session(engine)
+        service = TitleService(session=session)
+        with count_queries(engine) as counter:
+            service.get_titles(user=None)
+        elapsed = timed(service.get_titles, user=None)
+        print(f"{size:>8} {counter['queries']:>8} {elapsed:>10.2f}")
+        session.close()
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,158 @@
-from typing import Any, Generic, List, Optional, Type, TypeVar
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Tuple,
+    TypeVar,
+)
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, exc, false, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
+from models.async_db import get_db
 from models.database import get_session
 from models.models import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+MAX_BATCH_SIZE = 100
 
 
-class CRUDBase(Generic[ModelType]):
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Opaque cursor holding the keyset values of the last row of a page.
+    """
+    raw = json.dumps(jsonable_encoder(list(values)), separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value)
+            if value is not None and column.type.python_type is datetime
+            else value
+            for column, value in zip(columns, values)
+        ]
+    except (binascii.Error, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def keyset_after(
+    columns: Sequence[Any],
+    values: Sequence[Any],
+    descending: Optional[Sequence[bool]] = None,
+):
+    """
+    Predicate selecting rows ordered strictly after `values` by `columns`.
+
+    Expanded to (a > x) OR (a = x AND b > y) so any index on the keyset
+    columns can serve it as a range scan. Descending columns compare the
+    other way; NULL sorts first as in sqlite, so nullable columns get the
+    matching IS NULL branches.
+    """
+    descending = descending or [False] * len(columns)
+    column, value, desc = columns[0], values[0], descending[0]
+    after = _after(column, value, desc)
+    if len(columns) == 1:
+        return after
+    equal = column.is_(None) if value is None else column == value
+    return or_(
+        after,
+        and_(equal, keyset_after(columns[1:], values[1:], descending[1:])),
+    )
+
+
+def _after(column, value, desc: bool):
+    nullable = getattr(column, 'nullable', True)
+    if value is None:
+        # NULL is the smallest value: first ascending, last descending
+        return false() if desc else column.isnot(None)
+    if desc and nullable:
+        return or_(column < value, column.is_(None))
+    return column < value if desc else column > value
+
+
+def parse_keyset(keyset: Sequence[str]) -> List[Tuple[str, bool]]:
+    """
+    Split keyset entries into (attribute, descending), "-rating" sorts
+    the rating descending.
+    """
+    return [(name.lstrip('-'), name.startswith('-')) for name in keyset]
+
+
+class KeysetPagination:
+    # model attributes defining the pagination order, the last one unique;
+    # a leading "-" sorts that attribute descending
+    keyset = ('id',)
+
+    def page_statement(
+        self,
+        stmt: Select,
+        cursor: Optional[str],
+        limit: int,
+        keyset: Optional[Sequence[str]] = None,
+    ) -> Select:
+        """
+        Restrict `stmt` to the page after `cursor`, fetching one extra row
+        to learn whether a next page exists.
+        """
+        keyset = parse_keyset(keyset or self.keyset)
+        columns = [getattr(self.model, name) for name, _ in keyset]
+        descending = [desc for _, desc in keyset]
+        if cursor:
+            values = decode_cursor(cursor, columns)
+            stmt = stmt.where(keyset_after(columns, values, descending))
+        order = [
+            column.desc() if desc else column
+            for column, desc in zip(columns, descending)
+        ]
+        return stmt.order_by(*order).limit(limit + 1)
+
+    def page_result(
+        self,
+        rows: Sequence[Any],
+        limit: int,
+        keyset: Optional[Sequence[str]] = None,
+    ) -> dict:
+        rows = list(rows)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(
+                [
+                    getattr(rows[-1], name)
+                    for name, _ in parse_keyset(keyset or self.keyset)
+                ]
+            )
+        return {'results': rows, 'next_cursor': next_cursor}
+
+    def list_statement(self) -> Select:
+        return select(*self.model.__table__.columns)
+
+
+class CRUDBase(KeysetPagination, Generic[ModelType]):
     def __init__(
         self, model: Type[ModelType], session: Session = Depends(get_session)
     ):
@@ -30,11 +172,160 @@ class CRUDBase(Generic[ModelType]):
             self.session.query(self.model).filter(self.model.id == id).first()
         )
 
-    def get_multi(self, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        return self.session.query(self.model).offset(skip).limit(limit).all()
+    def get_multi(
+        self, *, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        return self.paginate(self.list_statement(), cursor=cursor, limit=limit)
+
+    def paginate(
+        self,
+        stmt: Select,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        keyset: Optional[Sequence[str]] = None,
+    ) -> dict:
+        """
+        Keyset pagination of a column `stmt` along `keyset`, by default
+        `self.keyset`.
+
+        Returns `{'results': rows, 'next_cursor': str | None}`; every page
+        costs one indexed range scan no matter how deep it is.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        rows = self.session.execute(
+            self.page_statement(stmt, cursor, limit, keyset)
+        ).all()
+        return self.page_result(rows, limit, keyset)
+
+    def get_batch(
+        self,
+        ids: Sequence[int],
+        stmt: Optional[Select] = None,
+        serialize: Optional[Callable[[List], List[dict]]] = None,
+    ) -> dict:
+        """
+        One item per distinct id of `ids`, in request order, read with a
+        single IN query on the primary key of `stmt` (by default
+        `list_statement()`). Ids without a row come back with `found` false.
+        """
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > MAX_BATCH_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_BATCH_SIZE} ids per request",
+            )
+        if stmt is None:
+            stmt = self.list_statement()
+        rows = self.session.execute(stmt.where(self.model.id.in_(ids))).all()
+        if serialize is None:
+            data = [row._asdict() for row in rows]
+        else:
+            data = serialize(rows)
+        found = {row.id: item for row, item in zip(rows, data)}
+        return {
+            'results': [
+                {'id': id, 'found': id in found, 'data': found.get(id)}
+                for id in ids
+            ]
+        }
 
     def remove(self, *, id: int) -> ModelType:
         obj = self.session.query(self.model).get(id)
         self.session.delete(obj)
         self.session.commit()
         return obj
+
+    def commit_unique(self, detail: str):
+        """
+        Commit, turning a unique constraint violation into a 400 response.
+        """
+        self._unique(self.session.commit, detail)
+
+    def flush_unique(self, detail: str):
+        """
+        Flush pending rows to learn their ids, a unique constraint violation
+        becomes a 400 response as in `commit_unique`.
+        """
+        self._unique(self.session.flush, detail)
+
+    def _unique(self, write: Callable[[], None], detail: str):
+        try:
+            write()
+        except exc.IntegrityError:
+            self.session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=detail
+            )
+
+
+class AsyncCRUDBase(KeysetPagination, Generic[ModelType]):
+    # synchronous service whose methods `run_sync` executes
+    sync_service: Type[CRUDBase]
+
+    def __init__(
+        self, model: Type[ModelType], session: AsyncSession = Depends(get_db)
+    ):
+        """
+        CRUD object with the CRUDBase methods on an `AsyncSession`.
+
+        Service specific methods reuse the synchronous implementation through
+        `run_sync`: SQLAlchemy drives it in a greenlet and every statement is
+        awaited on the aiosqlite connection, so the event loop never blocks
+        on the database.
+        """
+        self.model = model
+        self.session = session
+
+    async def run_sync(
+        self,
+        method: Callable[..., Any],
+        *args,
+        response_model: Any = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Call `method` of `sync_service` bound to this session.
+
+        ORM results are converted to `response_model` while still inside the
+        greenlet, lazy loads are impossible once control returns here.
+        """
+
+        def call(session: Session) -> Any:
+            service = self.sync_service(session=session)
+            result = method(service, *args, **kwargs)
+            if response_model is not None and result is not None:
+                result = response_model.from_orm(result)
+            return result
+
+        return await self.session.run_sync(call)
+
+    async def get(self, id: Any) -> Optional[ModelType]:
+        return await self.session.get(self.model, id)
+
+    async def get_multi(
+        self, *, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        return await self.paginate(
+            self.list_statement(), cursor=cursor, limit=limit
+        )
+
+    async def paginate(
+        self,
+        stmt: Select,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        keyset: Optional[Sequence[str]] = None,
+    ) -> dict:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        result = await self.session.execute(
+            self.page_statement(stmt, cursor, limit, keyset)
+        )
+        return self.page_result(result.all(), limit, keyset)
+
+    async def remove(self, *, id: int) -> ModelType:
+        obj = await self.session.get(self.model, id)
+        await self.session.delete(obj)
+        await self.session.commit()
+        return obj
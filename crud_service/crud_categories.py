@@ -1,11 +1,16 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from models import models
+from models.async_db import get_db
 from models.database import get_session
 from schemas.schemas import Category
-from .crud_base import CRUDBase
+from .crud_base import DEFAULT_PAGE_SIZE, AsyncCRUDBase, CRUDBase
+from .crud_versions import CATEGORIES, TITLES, bump_versions
 
 
 class CategoryService(CRUDBase[models.Category]):
@@ -13,6 +18,17 @@ class CategoryService(CRUDBase[models.Category]):
         self.session = session
         self.model = models.Category
 
+    def get_multi(
+        self, *, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        page = super().get_multi(cursor=cursor, limit=limit)
+        page['results'] = [self._serialize(row) for row in page['results']]
+        return page
+
+    @staticmethod
+    def _serialize(row) -> dict:
+        return {'name': row.name, 'slug': row.slug}
+
     def create(self, data: Category, user: models.User) -> models.Category:
         data = data.dict()
         name = data.get('name')
@@ -29,12 +45,38 @@ class CategoryService(CRUDBase[models.Category]):
             )
         category = self.model(**data)
         self.session.add(category)
-        self.session.commit()
+        bump_versions(self.session, CATEGORIES)
+        self.commit_unique("Category already exist")
         self.session.refresh(category)
         return category
 
     def remove(self, slug: str):
         query = delete(self.model).where(self.model.slug == slug)
         self.session.execute(query)
+        # titles embed their category
+        bump_versions(self.session, CATEGORIES, TITLES)
         self.session.commit()
         return None
+
+
+class AsyncCategoryService(AsyncCRUDBase[models.Category]):
+    sync_service = CategoryService
+
+    def __init__(self, session: AsyncSession = Depends(get_db)):
+        self.session = session
+        self.model = models.Category
+
+    async def get_multi(
+        self, *, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        return await self.run_sync(
+            CategoryService.get_multi, cursor=cursor, limit=limit
+        )
+
+    async def create(self, data: Category, user: models.User) -> Category:
+        return await self.run_sync(
+            CategoryService.create, data, user, response_model=Category
+        )
+
+    async def remove(self, slug: str):
+        return await self.run_sync(CategoryService.remove, slug)
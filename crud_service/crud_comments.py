@@ -1,16 +1,26 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select, update
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql import Select
 
 from models import models
+from models.async_db import get_db
 from models.database import get_session
+from models.search import comment_search
 from schemas.schemas import CommentIn, CommentOut
 from services.permissions import UserPermissions
-from .crud_base import CRUDBase
+from .crud_base import DEFAULT_PAGE_SIZE, AsyncCRUDBase, CRUDBase
+from .crud_search import reindex, unindex
+from .crud_versions import bump_versions, comments_version
 
 
 class CommentService(CRUDBase[models.Comment]):
+    keyset = ('pub_date', 'id')
+
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
         self.model = models.Comment
@@ -19,8 +29,8 @@ class CommentService(CRUDBase[models.Comment]):
         self, obj_in: CommentIn, user: models.User, review_id: int
     ) -> models.Comment:
         review = (
-            self.session.query(self.model)
-            .filter(self.model.id == review_id)
+            self.session.query(models.Review)
+            .filter(models.Review.id == review_id)
             .first()
         )
         if review is None:
@@ -34,28 +44,35 @@ class CommentService(CRUDBase[models.Comment]):
             review_id=review_id,
         )
         self.session.add(db_obj)
+        self.session.flush()
+        reindex(self.session, comment_search, self.model.id == db_obj.id)
+        bump_versions(self.session, comments_version(review_id))
         self.session.commit()
         self.session.refresh(db_obj)
         response = jsonable_encoder(db_obj)
         comment = CommentOut(author=user.username, **response)
         return comment
 
-    def get_multi(self, review_id: int, skip: int = 0, limit: int = 100):
-        query = (
-            self.session.query(self.model)
-            .filter(self.model.review_id == review_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+    def get_multi(
+        self,
+        review_id: int,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> dict:
+        query = self.list_statement().where(
+            self.model.review_id == review_id
         )
-        response = []
-        for comment in query:
-            comment_dic = jsonable_encoder(comment)
-            comment_dic = CommentOut(
-                author=comment.author.username, **comment_dic
-            )
-            response.append(comment_dic)
-        return response
+        page = self.paginate(query, cursor=cursor, limit=limit)
+        page['results'] = [row._asdict() for row in page['results']]
+        return page
+
+    def list_statement(self) -> Select:
+        return select(
+            self.model.id,
+            self.model.text,
+            self.model.pub_date,
+            models.User.username.label('author'),
+        ).join(models.User, self.model.author_id == models.User.id)
 
     def update(
         self, obj_in: CommentIn, user: models.User, comment_id: int
@@ -77,9 +94,61 @@ class CommentService(CRUDBase[models.Comment]):
         data = obj_in.dict(exclude_unset=True)
         query = update(self.model).where(self.model.id == comment_id).values(**data)
         self.session.execute(query)
+        reindex(self.session, comment_search, self.model.id == comment_id)
+        bump_versions(self.session, comments_version(comment.review_id))
         self.session.commit()
-        query = select(self.model).where(self.model.id == comment_id)
+        query = (
+            select(self.model)
+            .options(joinedload(self.model.author))
+            .where(self.model.id == comment_id)
+        )
         comment = self.session.execute(query).scalars().first()
-        comment_dic = jsonable_encoder(comment)
-        response = CommentOut(author=comment.author.username, **comment_dic)
-        return response
+        return CommentOut(
+            id=comment.id,
+            text=comment.text,
+            author=comment.author.username,
+            pub_date=comment.pub_date,
+        )
+
+    def remove(self, *, id: int) -> models.Comment:
+        comment = self.session.get(self.model, id)
+        if comment is not None:
+            bump_versions(self.session, comments_version(comment.review_id))
+            unindex(self.session, comment_search, [id])
+        return super().remove(id=id)
+
+
+class AsyncCommentService(AsyncCRUDBase[models.Comment]):
+    keyset = CommentService.keyset
+    sync_service = CommentService
+
+    def __init__(self, session: AsyncSession = Depends(get_db)):
+        self.session = session
+        self.model = models.Comment
+
+    async def create(
+        self, obj_in: CommentIn, user: models.User, review_id: int
+    ) -> CommentOut:
+        return await self.run_sync(
+            CommentService.create, obj_in, user, review_id
+        )
+
+    async def get_multi(
+        self,
+        review_id: int,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> dict:
+        return await self.run_sync(
+            CommentService.get_multi, review_id, cursor=cursor, limit=limit
+        )
+
+    async def update(
+        self, obj_in: CommentIn, user: models.User, comment_id: int
+    ) -> CommentOut:
+        return await self.run_sync(
+            CommentService.update, obj_in, user, comment_id
+        )
+
+    async def remove(self, *, id: int):
+        return await self.run_sync(CommentService.remove, id=id)
@@ -0,0 +1,63 @@
+from typing import Callable, Iterator, List, Optional
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from models import models
+from models.database import get_session
+from .crud_comments import CommentService
+from .crud_reviews import ReviewService
+from .crud_titles import TitleService
+
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportService:
+    """
+    Streams whole tables in id order, one batch of payload dicts at a time.
+
+    Rows are fetched with `yield_per`, so memory stays bounded by the batch
+    size however large the table is.
+    """
+
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+
+    def titles(self) -> Iterator[List[dict]]:
+        service = TitleService(session=self.session)
+        stmt = service.list_statement().order_by(models.Title.id)
+        return self._stream(stmt, service.serialize_rows)
+
+    def reviews(self, title_id: Optional[int] = None) -> Iterator[List[dict]]:
+        stmt = ReviewService(session=self.session).list_statement()
+        if title_id is not None:
+            stmt = stmt.where(models.Review.title_id == title_id)
+        return self._stream(stmt.order_by(models.Review.id))
+
+    def comments(
+        self, review_id: Optional[int] = None
+    ) -> Iterator[List[dict]]:
+        stmt = CommentService(session=self.session).list_statement()
+        if review_id is not None:
+            stmt = stmt.where(models.Comment.review_id == review_id)
+        return self._stream(stmt.order_by(models.Comment.id))
+
+    def _stream(
+        self,
+        stmt: Select,
+        serialize: Optional[Callable[[List], List[dict]]] = None,
+    ) -> Iterator[List[dict]]:
+        result = self.session.execute(
+            stmt.execution_options(
+                stream_results=True, yield_per=EXPORT_BATCH_SIZE
+            )
+        )
+        try:
+            for partition in result.partitions():
+                if serialize is None:
+                    yield [row._asdict() for row in partition]
+                else:
+                    yield serialize(partition)
+        finally:
+            result.close()
@@ -0,0 +1,94 @@
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import models
+from models.async_db import get_db
+from models.database import get_session
+from schemas.schemas import Genre
+from .crud_base import DEFAULT_PAGE_SIZE, AsyncCRUDBase, CRUDBase
+from .crud_versions import GENRES, TITLES, bump_versions, title_version
+
+
+class GenreService(CRUDBase[models.Genre]):
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+        self.model = models.Genre
+
+    def get_multi(
+        self, *, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        page = super().get_multi(cursor=cursor, limit=limit)
+        page['results'] = [self._serialize(row) for row in page['results']]
+        return page
+
+    @staticmethod
+    def _serialize(row) -> dict:
+        return {'name': row.name, 'slug': row.slug}
+
+    def create(self, data: Genre, user: models.User) -> models.Genre:
+        data = data.dict()
+        genre = (
+            self.session.query(self.model)
+            .filter(self.model.slug == data.get('slug'))
+            .first()
+        )
+        if genre is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Genre already exist",
+            )
+        genre = self.model(**data)
+        self.session.add(genre)
+        bump_versions(self.session, GENRES)
+        self.commit_unique("Genre already exist")
+        self.session.refresh(genre)
+        return genre
+
+    def remove(self, slug: str):
+        genre_id = self.session.execute(
+            select(self.model.id).where(self.model.slug == slug)
+        ).scalar()
+        if genre_id is None:
+            return None
+        link = models.title_genre
+        title_ids = self.session.execute(
+            select(link.c.title_id).where(link.c.genre_id == genre_id)
+        ).scalars().all()
+        self.session.execute(delete(link).where(link.c.genre_id == genre_id))
+        self.session.execute(
+            delete(self.model).where(self.model.id == genre_id)
+        )
+        names = [GENRES]
+        if title_ids:
+            # titles embed their genres
+            names += [TITLES, *map(title_version, title_ids)]
+        bump_versions(self.session, *names)
+        self.session.commit()
+        return None
+
+
+class AsyncGenreService(AsyncCRUDBase[models.Genre]):
+    sync_service = GenreService
+
+    def __init__(self, session: AsyncSession = Depends(get_db)):
+        self.session = session
+        self.model = models.Genre
+
+    async def get_multi(
+        self, *, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+    ) -> dict:
+        return await self.run_sync(
+            GenreService.get_multi, cursor=cursor, limit=limit
+        )
+
+    async def create(self, data: Genre, user: models.User) -> Genre:
+        return await self.run_sync(
+            GenreService.create, data, user, response_model=Genre
+        )
+
+    async def remove(self, slug: str):
+        return await self.run_sync(GenreService.remove, slug)
@@ -0,0 +1,425 @@
+import csv
+import io
+from collections import defaultdict
+from datetime import datetime
+from enum import Enum
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple, Type
+
+import orjson
+from fastapi import Depends
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import exc, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from models import models
+from models.database import get_session
+from models.search import review_search, title_search
+from schemas.imports import ReviewRow, SluggedRow, TitleRow
+from .crud_ratings import add_review_scores, record_activity
+from .crud_search import reindex
+from .crud_versions import (
+    CATEGORIES,
+    GENRES,
+    TITLES,
+    bump_versions,
+    reviews_version,
+    title_version,
+)
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportKind(str, Enum):
+    CATEGORIES = 'categories'
+    GENRES = 'genres'
+    TITLES = 'titles'
+    REVIEWS = 'reviews'
+
+
+class ImportFormat(str, Enum):
+    NDJSON = 'ndjson'
+    JSON = 'json'
+    CSV = 'csv'
+
+
+class InvalidRow(ValueError):
+    """
+    Yielded by `read_rows` in place of a record that could not be parsed.
+    """
+
+
+def read_rows(
+    stream: BinaryIO, import_format: ImportFormat
+) -> Iterator[object]:
+    """
+    Parse an upload into one dict per record.
+
+    NDJSON and CSV are read incrementally, a JSON array is loaded whole.
+    Unparsable records come out as `InvalidRow` so they are reported
+    against their position instead of aborting the import.
+    """
+    if import_format == ImportFormat.CSV:
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        for record in csv.DictReader(text):
+            yield {
+                key: value if value != '' else None
+                for key, value in record.items()
+            }
+    elif import_format == ImportFormat.JSON:
+        try:
+            records = orjson.loads(stream.read())
+        except orjson.JSONDecodeError as error:
+            yield InvalidRow(str(error))
+            return
+        if not isinstance(records, list):
+            yield InvalidRow("expected a JSON array")
+            return
+        for record in records:
+            if isinstance(record, dict):
+                yield record
+            else:
+                yield InvalidRow("expected a JSON object")
+    else:
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError as error:
+                yield InvalidRow(str(error))
+                continue
+            if isinstance(record, dict):
+                yield record
+            else:
+                yield InvalidRow("expected a JSON object")
+
+
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+
+    def error(self, row: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'error': message})
+
+    def dict(self) -> dict:
+        return {
+            'imported': self.imported,
+            'error_count': self.error_count,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+        }
+
+
+class ImportService:
+    """
+    Bulk loads catalogue records.
+
+    Records are validated and resolved a chunk at a time: lookups of
+    existing names, slugs, titles and authors are single IN queries per
+    chunk and the accepted rows go in with one executemany INSERT and one
+    commit. Rejected records are reported by their position in the upload.
+    """
+
+    schemas: Dict[ImportKind, Type[BaseModel]] = {
+        ImportKind.CATEGORIES: SluggedRow,
+        ImportKind.GENRES: SluggedRow,
+        ImportKind.TITLES: TitleRow,
+        ImportKind.REVIEWS: ReviewRow,
+    }
+
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+        self._category_map = None
+
+    def import_rows(self, kind: ImportKind, rows: Iterable[object]) -> dict:
+        report = ImportReport()
+        chunk = []
+        for number, row in enumerate(rows, start=1):
+            chunk.append((number, row))
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                self._import_chunk(kind, chunk, report)
+                chunk = []
+        if chunk:
+            self._import_chunk(kind, chunk, report)
+        return report.dict()
+
+    def _import_chunk(
+        self,
+        kind: ImportKind,
+        chunk: List[Tuple[int, object]],
+        report: ImportReport,
+    ):
+        schema = self.schemas[kind]
+        valid = []
+        for number, row in chunk:
+            if isinstance(row, InvalidRow):
+                report.error(number, str(row))
+                continue
+            try:
+                valid.append((number, schema.parse_obj(row)))
+            except ValidationError as error:
+                report.error(number, self._describe(error))
+        if not valid:
+            return
+        importer = getattr(self, f'_{kind.value}')
+        # filled before the importer writes, the insert itself may raise
+        accepted: List[int] = []
+        try:
+            importer(valid, report, accepted)
+            self.session.commit()
+        except exc.IntegrityError as error:
+            # lost a race against a concurrent write: reject the rows the
+            # chunk was inserting, the others are reported already
+            self.session.rollback()
+            for number in accepted:
+                report.error(number, str(error.orig))
+            return
+        report.imported += len(accepted)
+
+    @staticmethod
+    def _describe(error: ValidationError) -> str:
+        return '; '.join(
+            '{}: {}'.format('.'.join(map(str, item['loc'])), item['msg'])
+            for item in error.errors()
+        )
+
+    def _categories(self, rows, report, accepted: List[int]):
+        self._slugged(models.Category, rows, report, accepted, "Category")
+        bump_versions(self.session, CATEGORIES)
+
+    def _genres(self, rows, report, accepted: List[int]):
+        self._slugged(models.Genre, rows, report, accepted, "Genre")
+        bump_versions(self.session, GENRES)
+
+    def _slugged(self, model, rows, report, accepted: List[int], label: str):
+        slugs = {row.slug for _, row in rows}
+        taken = set(
+            self.session.execute(
+                select(model.slug).where(model.slug.in_(slugs))
+            ).scalars()
+        )
+        values = []
+        for number, row in rows:
+            if row.slug in taken:
+                report.error(number, f"{label} already exist")
+                continue
+            taken.add(row.slug)
+            accepted.append(number)
+            values.append({'name': row.name, 'slug': row.slug})
+        self._insert(model, values)
+
+    def _titles(self, rows, report, accepted: List[int]):
+        categories = self._category_ids()
+        genres = dict(
+            self.session.execute(
+                select(models.Genre.slug, models.Genre.id).where(
+                    models.Genre.slug.in_(
+                        {slug for _, row in rows for slug in row.genres}
+                    )
+                )
+            ).all()
+        )
+        names = {row.name for _, row in rows}
+        taken = set(
+            self.session.execute(
+                select(models.Title.name).where(models.Title.name.in_(names))
+            ).scalars()
+        )
+        values = []
+        links = {}
+        for number, row in rows:
+            if row.name in taken:
+                report.error(number, "Title already exist")
+                continue
+            category_id = None
+            if row.category is not None:
+                category_id = categories.get(row.category)
+                if category_id is None:
+                    report.error(number, "No such Category")
+                    continue
+            if not genres.keys() >= set(row.genres):
+                report.error(number, "No such Genre")
+                continue
+            links[row.name] = {genres[slug] for slug in row.genres}
+            taken.add(row.name)
+            accepted.append(number)
+            values.append(
+                {
+                    'name': row.name,
+                    'year': row.year,
+                    'description': row.description,
+                    'category_id': category_id,
+                }
+            )
+        bump_versions(self.session, TITLES)
+        self._insert(models.Title, values)
+        if values:
+            names = [value['name'] for value in values]
+            inserted = models.Title.name.in_(names)
+            reindex(self.session, title_search, inserted)
+            self._link_genres(inserted, links)
+
+    def _link_genres(self, inserted, links: Dict[str, set]):
+        if not any(links.values()):
+            return
+        ids = self.session.execute(
+            select(models.Title.name, models.Title.id).where(inserted)
+        ).all()
+        self.session.execute(
+            insert(models.title_genre),
+            [
+                {'title_id': title_id, 'genre_id': genre_id}
+                for name, title_id in ids
+                for genre_id in links[name]
+            ],
+        )
+
+    def _category_ids(self) -> Dict[str, int]:
+        """
+        Category id by slug and by name, loaded once per import.
+        """
+        if self._category_map is None:
+            rows = self.session.execute(
+                select(
+                    models.Category.id,
+                    models.Category.name,
+                    models.Category.slug,
+                )
+            ).all()
+            self._category_map = {row.name: row.id for row in rows}
+            self._category_map.update({row.slug: row.id for row in rows})
+        return self._category_map
+
+    def _reviews(self, rows, report, accepted: List[int]):
+        title_names = {row.title for _, row in rows if row.title_id is None}
+        title_ids = {
+            row.title_id for _, row in rows if row.title_id is not None
+        }
+        titles_by_name = dict(
+            self.session.execute(
+                select(models.Title.name, models.Title.id).where(
+                    models.Title.name.in_(title_names)
+                )
+            ).all()
+        )
+        known_ids = set(
+            self.session.execute(
+                select(models.Title.id).where(models.Title.id.in_(title_ids))
+            ).scalars()
+        )
+        authors = dict(
+            self.session.execute(
+                select(models.User.username, models.User.id).where(
+                    models.User.username.in_({row.author for _, row in rows})
+                )
+            ).all()
+        )
+        now = datetime.now()
+        deltas = defaultdict(lambda: [0, 0])
+        activity = defaultdict(int)
+        values = []
+        for number, row in rows:
+            if row.title_id is not None:
+                title_id = row.title_id if row.title_id in known_ids else None
+            else:
+                title_id = titles_by_name.get(row.title)
+            if title_id is None:
+                report.error(number, "Title not found.")
+                continue
+            author_id = authors.get(row.author)
+            if author_id is None:
+                report.error(number, "No such user")
+                continue
+            accepted.append(number)
+            values.append(
+                {
+                    'title_id': title_id,
+                    'author_id': author_id,
+                    'text': row.text,
+                    'score': row.score,
+                    'pub_date': row.pub_date or now,
+                }
+            )
+            deltas[title_id][0] += 1
+            deltas[title_id][1] += row.score
+            activity[title_id, (row.pub_date or now).date()] += 1
+        self._insert(models.Review, values)
+        if values:
+            inserted = models.Review.id.in_(self._inserted_ids(values))
+            reindex(self.session, review_search, inserted)
+        add_review_scores(
+            self.session,
+            {title_id: tuple(delta) for title_id, delta in deltas.items()},
+        )
+        record_activity(self.session, activity)
+        bump_versions(
+            self.session,
+            TITLES,
+            *map(title_version, deltas),
+            *map(reviews_version, deltas),
+        )
+
+    def _inserted_ids(self, values: List[dict]) -> List[int]:
+        """
+        Ids of the reviews inserted from `values`, matched on title,
+        author and date; an older review sharing all three would only be
+        indexed again. The title_id IN list lets the index narrow the
+        search to the chunk's titles.
+        """
+        review = models.Review
+        keys = {
+            (value['title_id'], value['author_id'], value['pub_date'])
+            for value in values
+        }
+        return self.session.execute(
+            select(review.id).where(
+                review.title_id.in_({key[0] for key in keys}),
+                tuple_(review.title_id, review.author_id, review.pub_date).in_(
+                    keys
+                ),
+            )
+        ).scalars().all()
+
+    def _insert(self, model, values: List[dict]):
+        if values:
+            self.session.execute(insert(model), values)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from models.database import Session as SessionLocal
+
+    parser = argparse.ArgumentParser(
+        description="Bulk import catalogue records from a file or stdin."
+    )
+    parser.add_argument('kind', choices=[kind.value for kind in ImportKind])
+    parser.add_argument('file', help="path of the upload, - for stdin")
+    parser.add_argument(
+        '--format',
+        choices=[import_format.value for import_format in ImportFormat],
+        help="defaults to the file extension, ndjson for stdin",
+    )
+    args = parser.parse_args()
+    import_format = args.format
+    if import_format is None:
+        extension = args.file.rsplit('.', 1)[-1].lower()
+        valid_formats = {item.value for item in ImportFormat}
+        import_format = extension if extension in valid_formats else 'ndjson'
+    if args.file == '-':
+        stream = sys.stdin.buffer
+    else:
+        stream = open(args.file, 'rb')
+    with stream, SessionLocal() as session:
+        rows = read_rows(stream, ImportFormat(import_format))
+        report = ImportService(session=session).import_rows(
+            ImportKind(args.kind), rows
+        )
+    sys.stdout.write(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
+    sys.stdout.write('\n')
+    sys.exit(1 if report['error_count'] else 0)
@@ -0,0 +1,145 @@
+from datetime import date
+from enum import Enum
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from models import models
+from models.database import get_session
+from .crud_ratings import week_start
+
+DEFAULT_LEADERBOARD_SIZE = 10
+MAX_LEADERBOARD_SIZE = 100
+
+
+class LeaderboardKind(str, Enum):
+    RATING = 'rating'
+    REVIEWS = 'reviews'
+    WEEKLY = 'weekly'
+
+
+def activity_version(week: date) -> str:
+    # never bumped, gives each week's board validators of its own; the
+    # response cache tells the weeks apart by key
+    return f'activity:{week.isoformat()}'
+
+
+class LeaderboardService:
+    """
+    Top titles by rating, by review count and by reviews of a week.
+
+    Every board is read in rank order from an index: the stored title
+    aggregates for rating and review count, the weekly activity buckets
+    for the weekly board. A board of N titles costs N index entries
+    whatever the number of reviews; a category filter skips the entries
+    of other categories.
+    """
+
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+
+    def top(
+        self,
+        kind: LeaderboardKind,
+        category: Optional[str] = None,
+        limit: int = DEFAULT_LEADERBOARD_SIZE,
+        week: Optional[date] = None,
+    ) -> dict:
+        limit = max(1, min(limit, MAX_LEADERBOARD_SIZE))
+        if kind is LeaderboardKind.WEEKLY:
+            stmt = self._weekly(category, limit, week or date.today())
+        else:
+            stmt = self._ranked(kind, category, limit)
+        rows = self.session.execute(stmt).all()
+        return {
+            'kind': kind.value,
+            'results': [
+                self._serialize(rank, row)
+                for rank, row in enumerate(rows, start=1)
+            ],
+        }
+
+    @staticmethod
+    def _category_id(slug: str):
+        return (
+            select(models.Category.id)
+            .where(models.Category.slug == slug)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def _columns():
+        return (
+            models.Title.id,
+            models.Title.name,
+            models.Title.year,
+            models.Title.rating,
+            models.Title.review_count,
+            models.Category.name.label('category_name'),
+            models.Category.slug.label('category_slug'),
+        )
+
+    def _ranked(
+        self, kind: LeaderboardKind, category: Optional[str], limit: int
+    ) -> Select:
+        title = models.Title
+        if kind is LeaderboardKind.RATING:
+            order, qualified = title.rating, title.rating.isnot(None)
+        else:
+            order, qualified = title.review_count, title.review_count > 0
+        stmt = (
+            select(*self._columns())
+            .outerjoin(
+                models.Category, title.category_id == models.Category.id
+            )
+            .where(qualified)
+        )
+        if category is not None:
+            stmt = stmt.where(title.category_id == self._category_id(category))
+        # walks the ([category_id,] column, id) index backwards, no sort
+        return stmt.order_by(order.desc(), title.id.desc()).limit(limit)
+
+    def _weekly(
+        self, category: Optional[str], limit: int, day: date
+    ) -> Select:
+        activity = models.TitleActivity
+        stmt = (
+            select(
+                *self._columns(),
+                activity.review_count.label('week_reviews'),
+            )
+            .select_from(activity)
+            .join(models.Title, models.Title.id == activity.title_id)
+            .outerjoin(
+                models.Category,
+                models.Title.category_id == models.Category.id,
+            )
+            .where(activity.week == week_start(day), activity.review_count > 0)
+        )
+        if category is not None:
+            stmt = stmt.where(
+                models.Title.category_id == self._category_id(category)
+            )
+        # walks the (week, review_count, title_id) index backwards
+        return stmt.order_by(
+            activity.review_count.desc(), activity.title_id.desc()
+        ).limit(limit)
+
+    @staticmethod
+    def _serialize(rank: int, row) -> dict:
+        category = None
+        if row.category_slug is not None:
+            category = {'name': row.category_name, 'slug': row.category_slug}
+        return {
+            'rank': rank,
+            'id': row.id,
+            'name': row.name,
+            'year': row.year,
+            'category': category,
+            'rating': round(row.rating, 2) if row.rating is not None else None,
+            'review_count': row.review_count,
+            'week_reviews': getattr(row, 'week_reviews', None),
+        }
@@ -0,0 +1,210 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import (
+    Float,
+    bindparam,
+    cast,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from models import models
+from .crud_versions import (
+    TITLES,
+    bump_prefixed_versions,
+    bump_versions,
+    title_version,
+)
+
+# weeks of review activity kept for the weekly leaderboard
+ACTIVITY_RETENTION_WEEKS = 8
+
+
+def _apply_scores(session: Session, deltas: Dict[int, Tuple[int, int]]):
+    """
+    Shift the aggregates of each title by its (review count, score) delta.
+    """
+    if not deltas:
+        return
+    title = models.Title.__table__
+    review_count = title.c.review_count + bindparam('delta_count')
+    score_sum = title.c.score_sum + bindparam('delta_score')
+    stmt = (
+        update(title)
+        .where(title.c.id == bindparam('title_id'))
+        .values(
+            review_count=review_count,
+            score_sum=score_sum,
+            rating=cast(score_sum, Float) / func.nullif(review_count, 0),
+        )
+    )
+    session.connection().execute(
+        stmt,
+        [
+            {'title_id': title_id, 'delta_count': count, 'delta_score': score}
+            for title_id, (count, score) in deltas.items()
+        ],
+    )
+
+
+def score_delta(score: Optional[int], sign: int = 1) -> Tuple[int, int]:
+    """
+    (review count, score) delta of one review. An unscored review leaves
+    the aggregates alone, as AVG skips it in `rebuild_title_ratings`.
+    """
+    if score is None:
+        return 0, 0
+    return sign, sign * score
+
+
+def add_review_score(session: Session, title_id: int, score: int):
+    """
+    Account a new review in the stored title aggregates.
+
+    Runs in the caller's transaction, the caller commits.
+    """
+    _apply_scores(session, {title_id: score_delta(score)})
+
+
+def add_review_scores(session: Session, deltas: Dict[int, Tuple[int, int]]):
+    """
+    Account a batch of new reviews, `deltas` maps title id to the number of
+    reviews and the sum of their scores.
+    """
+    _apply_scores(session, deltas)
+
+
+def remove_review_score(session: Session, title_id: int, score: int):
+    """
+    Revert a deleted review from the stored title aggregates.
+    """
+    _apply_scores(session, {title_id: score_delta(score, -1)})
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def record_activity(session: Session, counts: Dict[Tuple[int, date], int]):
+    """
+    Shift the activity buckets by `counts`, (title id, day) -> reviews
+    added or, when negative, removed on that day.
+
+    Runs in the caller's transaction, the caller commits. Buckets past the
+    retention are dropped whenever new ones are created.
+    """
+    weekly = defaultdict(int)
+    for (title_id, day), count in counts.items():
+        weekly[title_id, week_start(day)] += count
+    counts = {key: count for key, count in weekly.items() if count}
+    if not counts:
+        return
+    activity = models.TitleActivity.__table__
+    connection = session.connection()
+    existing = {
+        tuple(row)
+        for row in connection.execute(
+            select(activity.c.title_id, activity.c.week).where(
+                tuple_(activity.c.title_id, activity.c.week).in_(list(counts))
+            )
+        )
+    }
+    if existing:
+        changes = [
+            {'b_title_id': key[0], 'b_week': key[1], 'delta': counts[key]}
+            for key in existing
+        ]
+        connection.execute(
+            update(activity)
+            .where(
+                activity.c.title_id == bindparam('b_title_id'),
+                activity.c.week == bindparam('b_week'),
+            )
+            .values(
+                review_count=activity.c.review_count + bindparam('delta')
+            ),
+            changes,
+        )
+    # removals from an already dropped bucket have nothing left to revert
+    missing = [
+        {'title_id': title_id, 'week': week, 'review_count': count}
+        for (title_id, week), count in counts.items()
+        if (title_id, week) not in existing and count > 0
+    ]
+    if missing:
+        cutoff = week_start(date.today()) - timedelta(
+            weeks=ACTIVITY_RETENTION_WEEKS
+        )
+        connection.execute(delete(activity).where(activity.c.week < cutoff))
+        connection.execute(insert(activity), missing)
+
+
+def rebuild_title_activity(session: Session):
+    """
+    Recompute the activity buckets of the retention period from the
+    reviews.
+    """
+    review = models.Review
+    # monday on or before the review's day, sqlite date modifiers
+    week = func.date(review.pub_date, 'weekday 0', '-6 days')
+    since = datetime.combine(
+        week_start(date.today())
+        - timedelta(weeks=ACTIVITY_RETENTION_WEEKS),
+        datetime.min.time(),
+    )
+    session.execute(delete(models.TitleActivity))
+    session.execute(
+        insert(models.TitleActivity).from_select(
+            ['title_id', 'week', 'review_count'],
+            select(review.title_id, week, func.count(review.id))
+            .where(review.title_id.isnot(None), review.pub_date >= since)
+            .group_by(review.title_id, week),
+        )
+    )
+    bump_versions(session, TITLES)
+    session.commit()
+
+
+def rebuild_title_ratings(session: Session):
+    """
+    Recompute review_count, score_sum and rating of every title in bulk.
+    Like the incremental updates, only scored reviews are counted.
+    """
+    review = models.Review
+    title = models.Title
+    reviews_of_title = review.title_id == title.id
+    session.execute(
+        update(title)
+        .values(
+            review_count=select(func.count(review.score))
+            .where(reviews_of_title)
+            .scalar_subquery(),
+            score_sum=select(func.coalesce(func.sum(review.score), 0))
+            .where(reviews_of_title)
+            .scalar_subquery(),
+            rating=select(func.avg(review.score))
+            .where(reviews_of_title)
+            .scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    bump_versions(session, TITLES)
+    bump_prefixed_versions(session, title_version(''))
+    session.commit()
+
+
+if __name__ == "__main__":
+    from models.database import Session as SessionLocal, engine
+    from models.migrations import migrate
+
+    migrate(engine)
+    with SessionLocal() as session:
+        rebuild_title_ratings(session)
+        rebuild_title_activity(session)
@@ -1,14 +1,36 @@
+from typing import List, Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql import Select
 
 from models import models
+from models.async_db import get_db
 from models.database import get_session
+from models.search import comment_search, review_search
 from schemas.schemas import Review, ReviewBase
-from .crud_base import CRUDBase
+from .crud_base import DEFAULT_PAGE_SIZE, AsyncCRUDBase, CRUDBase
+from .crud_ratings import (
+    add_review_score,
+    record_activity,
+    remove_review_score,
+)
+from .crud_search import reindex, unindex
+from .crud_versions import (
+    TITLES,
+    bump_versions,
+    comments_version,
+    reviews_version,
+    title_version,
+)
 
 
 class ReviewService(CRUDBase[models.Review]):
+    keyset = ('pub_date', 'id')
+
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
         self.model = models.Review
@@ -16,6 +38,7 @@ class ReviewService(CRUDBase[models.Review]):
     def get_review(self, title_id: int, review_id: int, user: models.User):
         query = (
             self.session.query(self.model)
+            .options(joinedload(self.model.author))
             .filter(
                 self.model.title_id == title_id,
                 self.model.id == review_id,
@@ -27,11 +50,21 @@ class ReviewService(CRUDBase[models.Review]):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No reviews found",
             )
-        response = jsonable_encoder(query)
-        response = Review(author=query.author.username, **response)
-        return response
+        return Review(
+            id=query.id,
+            text=query.text,
+            score=query.score,
+            author=query.author.username,
+            pub_date=query.pub_date,
+        )
 
-    def get_multi(self, title_id: int, user: models.User):
+    def get_multi(
+        self,
+        title_id: int,
+        user: models.User,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> dict:
         title = (
             self.session.query(models.Title)
             .filter(models.Title.id == title_id)
@@ -42,20 +75,23 @@ class ReviewService(CRUDBase[models.Review]):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Title not found",
             )
-        query = self.session.query(self.model).filter(
-            self.model.title_id == title_id
-        )
-        if query is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Review is not found",
-            )
-        response = []
-        for review in query:
-            review_dic = jsonable_encoder(review)
-            review_dic = Review(author=review.author.username, **review_dic)
-            response.append(review_dic)
-        return response
+        query = self.list_statement().where(self.model.title_id == title_id)
+        page = self.paginate(query, cursor=cursor, limit=limit)
+        page['results'] = [row._asdict() for row in page['results']]
+        return page
+
+    def get_reviews_by_ids(self, user: models.User, ids: List[int]) -> dict:
+        stmt = self.list_statement().add_columns(self.model.title_id)
+        return self.get_batch(ids, stmt)
+
+    def list_statement(self) -> Select:
+        return select(
+            self.model.id,
+            self.model.text,
+            self.model.score,
+            self.model.pub_date,
+            models.User.username.label('author'),
+        ).join(models.User, self.model.author_id == models.User.id)
 
     def create_review(
         self, title_id: int, data: ReviewBase, user: models.User
@@ -75,8 +111,87 @@ class ReviewService(CRUDBase[models.Review]):
         data['title_id'] = title_id
         review = self.model(**data)
         self.session.add(review)
+        self.session.flush()
+        reindex(self.session, review_search, self.model.id == review.id)
+        add_review_score(self.session, title_id, review.score)
+        record_activity(self.session, {(title_id, review.pub_date.date()): 1})
+        bump_versions(
+            self.session,
+            TITLES,
+            title_version(title_id),
+            reviews_version(title_id),
+        )
         self.session.commit()
         self.session.refresh(review)
         response = jsonable_encoder(review)
         review = Review(author=user.username, **response)
         return review
+
+    def remove(self, id: int) -> models.Review:
+        review = self.session.get(self.model, id)
+        if review is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Review is not found",
+            )
+        if review.title_id is not None:
+            remove_review_score(self.session, review.title_id, review.score)
+            record_activity(
+                self.session, {(review.title_id, review.pub_date.date()): -1}
+            )
+            bump_versions(
+                self.session,
+                TITLES,
+                title_version(review.title_id),
+                reviews_version(review.title_id),
+            )
+        bump_versions(self.session, comments_version(id))
+        unindex(
+            self.session,
+            comment_search,
+            select(models.Comment.id).where(models.Comment.review_id == id),
+        )
+        unindex(self.session, review_search, [id])
+        self.session.execute(
+            delete(models.Comment).where(models.Comment.review_id == id)
+        )
+        self.session.delete(review)
+        self.session.commit()
+        return None
+
+
+class AsyncReviewService(AsyncCRUDBase[models.Review]):
+    keyset = ReviewService.keyset
+    sync_service = ReviewService
+
+    def __init__(self, session: AsyncSession = Depends(get_db)):
+        self.session = session
+        self.model = models.Review
+
+    async def get_review(
+        self, title_id: int, review_id: int, user: models.User
+    ) -> Review:
+        return await self.run_sync(
+            ReviewService.get_review, title_id, review_id, user
+        )
+
+    async def get_multi(
+        self,
+        title_id: int,
+        user: models.User,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> dict:
+        return await self.run_sync(
+            ReviewService.get_multi, title_id, user, cursor=cursor, limit=limit
+        )
+
+    async def create_review(
+        self, title_id: int, data: ReviewBase, user: models.User
+    ) -> Review:
+        return await self.run_sync(
+            ReviewService.create_review, title_id, data, user
+        )
+
+    async def remove(self, id: int):
+        return await self.run_sync(ReviewService.remove, id)
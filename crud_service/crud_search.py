@@ -0,0 +1,209 @@
+import re
+from enum import Enum
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import (
+    Integer,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from models import models
+from models.database import get_session
+from models.search import (
+    SEARCH_SOURCES,
+    comment_search,
+    review_search,
+    title_search,
+)
+from .crud_base import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+)
+
+SNIPPET_TOKENS = 16
+TOKEN = re.compile(r'\w+\*?')
+OFFSET = column('offset', Integer)
+
+
+class SearchKind(str, Enum):
+    TITLES = 'titles'
+    REVIEWS = 'reviews'
+    COMMENTS = 'comments'
+
+
+SEARCH_TABLES = {
+    SearchKind.TITLES: title_search,
+    SearchKind.REVIEWS: review_search,
+    SearchKind.COMMENTS: comment_search,
+}
+SOURCE_MODELS = {
+    title_search: models.Title,
+    review_search: models.Review,
+    comment_search: models.Comment,
+}
+
+
+def reindex(session: Session, table, where):
+    """
+    Refresh the search rows of the source rows matching `where`.
+
+    Runs in the caller's transaction after the rows are flushed, the
+    caller commits.
+    """
+    _, columns = SEARCH_SOURCES[table]
+    model = SOURCE_MODELS[table]
+    rows = select(model.id, *(getattr(model, name) for name in columns))
+    rows = rows.where(where)
+    unindex(session, table, select(model.id).where(where))
+    session.execute(insert(table).from_select(['rowid', *columns], rows))
+
+
+def unindex(session: Session, table, ids):
+    """
+    Drop the search rows of `ids`, a list or a select of source ids. Call
+    it before deleting the source rows a select refers to.
+    """
+    session.execute(delete(table).where(table.c.rowid.in_(ids)))
+
+
+def match_expression(query: str) -> str:
+    """
+    FTS5 query matching every word of `query`, a trailing * keeps the
+    word a prefix. Quoting each word keeps user input from being parsed
+    as FTS5 syntax.
+    """
+    terms = [
+        '"{}"{}'.format(word.rstrip('*'), '*' if word.endswith('*') else '')
+        for word in TOKEN.findall(query)
+    ]
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Empty search query",
+        )
+    return ' '.join(terms)
+
+
+def decode_offset(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    (offset,) = decode_cursor(cursor, [OFFSET])
+    if not isinstance(offset, int) or offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return offset
+
+
+class SearchService:
+    """
+    Ranked full-text search over the FTS5 tables.
+
+    The MATCH runs in a subquery ordered by rank with the page's LIMIT, so
+    FTS5 returns the best hits directly and only those are joined to their
+    source rows. Results are ranked, so the cursor holds an offset.
+    """
+
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+
+    def search(
+        self,
+        kind: SearchKind,
+        query: str,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> dict:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        offset = decode_offset(cursor)
+        statement = getattr(self, f'_{kind.value}')
+        hits = self._hits(
+            SEARCH_TABLES[kind], match_expression(query), offset, limit
+        )
+        rows = self.session.execute(
+            statement(hits).order_by(hits.c.rank)
+        ).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([offset + limit])
+        return {
+            'results': [row._asdict() for row in rows],
+            'next_cursor': next_cursor,
+        }
+
+    @staticmethod
+    def _hits(table, match: str, offset: int, limit: int):
+        fts = literal_column(table.name)
+        return (
+            select(
+                table.c.rowid.label('id'),
+                table.c.rank,
+                func.snippet(
+                    fts, -1, '<mark>', '</mark>', '…', SNIPPET_TOKENS
+                ).label('snippet'),
+            )
+            .where(fts.op('MATCH')(match))
+            .order_by(table.c.rank)
+            .limit(limit + 1)
+            .offset(offset)
+            .subquery()
+        )
+
+    @staticmethod
+    def _titles(hits) -> Select:
+        return (
+            select(
+                models.Title.id,
+                models.Title.name,
+                models.Title.year,
+                models.Title.rating,
+                hits.c.snippet,
+            )
+            .select_from(hits)
+            .join(models.Title, models.Title.id == hits.c.id)
+        )
+
+    @staticmethod
+    def _reviews(hits) -> Select:
+        return (
+            select(
+                models.Review.id,
+                models.Review.title_id,
+                models.Review.score,
+                models.Review.pub_date,
+                models.User.username.label('author'),
+                hits.c.snippet,
+            )
+            .select_from(hits)
+            .join(models.Review, models.Review.id == hits.c.id)
+            .join(models.User, models.Review.author_id == models.User.id)
+        )
+
+    @staticmethod
+    def _comments(hits) -> Select:
+        return (
+            select(
+                models.Comment.id,
+                models.Comment.review_id,
+                models.Review.title_id,
+                models.Comment.pub_date,
+                models.User.username.label('author'),
+                hits.c.snippet,
+            )
+            .select_from(hits)
+            .join(models.Comment, models.Comment.id == hits.c.id)
+            .join(models.Review, models.Comment.review_id == models.Review.id)
+            .join(models.User, models.Comment.author_id == models.User.id)
+        )
@@ -1,52 +1,186 @@
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional
+
 from fastapi import Depends, HTTPException, status
-from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
+from sqlalchemy.sql import Select
 
 from models import models
+from models.async_db import get_db
 from models.database import get_session
-from schemas.schemas import TitleBase
+from models.search import comment_search, review_search, title_search
+from schemas.schemas import TitleBase, TitleFilter, TitleSort
+from .crud_base import DEFAULT_PAGE_SIZE, AsyncCRUDBase, CRUDBase
+from .crud_search import reindex, unindex
+from .crud_versions import (
+    TITLES,
+    bump_versions,
+    comments_version,
+    reviews_version,
+    title_version,
+)
+
 
+class TitleService(CRUDBase[models.Title]):
+    # sort order -> keyset, names are unique so need no tie breaker
+    sort_keysets = {
+        TitleSort.ID: ('id',),
+        TitleSort.NAME: ('name',),
+        TitleSort.NAME_DESC: ('-name',),
+        TitleSort.YEAR: ('year', 'id'),
+        TitleSort.YEAR_DESC: ('-year', '-id'),
+        TitleSort.RATING: ('rating', 'id'),
+        TitleSort.RATING_DESC: ('-rating', '-id'),
+    }
 
-class TitleService:
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
+        self.model = models.Title
+
+    def list_statement(self) -> Select:
+        return select(
+            models.Title.id,
+            models.Title.name,
+            models.Title.year,
+            models.Title.description,
+            models.Title.rating,
+            models.Category.name.label('category_name'),
+            models.Category.slug.label('category_slug'),
+        ).outerjoin(
+            models.Category, models.Title.category_id == models.Category.id
+        )
+
+    def get_titles(
+        self,
+        user: models.User,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        filters: Optional[TitleFilter] = None,
+        sort: TitleSort = TitleSort.ID,
+    ) -> dict:
+        stmt = self.list_statement()
+        if filters is not None:
+            stmt = self.filter_statement(stmt, filters)
+        page = self.paginate(
+            stmt, cursor=cursor, limit=limit, keyset=self.sort_keysets[sort]
+        )
+        page['results'] = self.serialize_rows(page['results'])
+        return page
 
-    def get_titles(self, user: models.User):
-        query = self.session.query(models.Title).all()
-        response = []
-        for title in query:
-            dic = jsonable_encoder(title)
-            rating = (
-                self.session.query(
-                    func.avg(models.Review.score).label('rating')
+    @staticmethod
+    def filter_statement(stmt: Select, filters: TitleFilter) -> Select:
+        """
+        Every filter is a sargable predicate on an indexed title column: the
+        category slug is resolved to its id by a scalar subquery and the
+        name prefix becomes a range on the (case-sensitive) name index.
+        """
+        title = models.Title
+        if filters.category is not None:
+            category_id = (
+                select(models.Category.id)
+                .where(models.Category.slug == filters.category)
+                .scalar_subquery()
+            )
+            stmt = stmt.where(title.category_id == category_id)
+        if filters.genre is not None:
+            genre_id = (
+                select(models.Genre.id)
+                .where(models.Genre.slug == filters.genre)
+                .scalar_subquery()
+            )
+            # answered from the (genre_id, title_id) index alone
+            stmt = stmt.where(
+                title.id.in_(
+                    select(models.title_genre.c.title_id).where(
+                        models.title_genre.c.genre_id == genre_id
+                    )
                 )
-                .filter(models.Review.title_id == title.id)
-                .scalar()
             )
-            if rating is not None:
-                dic.update({'rating': round(rating, 2)})
-            else:
-                dic.update({'rating': None})
-            response.append(dic)
-        return response
+        if filters.year_from is not None:
+            stmt = stmt.where(title.year >= filters.year_from)
+        if filters.year_to is not None:
+            stmt = stmt.where(title.year <= filters.year_to)
+        if filters.name_prefix:
+            prefix = filters.name_prefix
+            stmt = stmt.where(title.name >= prefix)
+            if ord(prefix[-1]) < sys.maxunicode:
+                upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                stmt = stmt.where(title.name < upper)
+        if filters.min_rating is not None:
+            stmt = stmt.where(title.rating >= filters.min_rating)
+        return stmt
 
     def get_title_by_id(self, user: models.User, title_id: int):
+        query = self.session.execute(
+            self.list_statement().where(models.Title.id == title_id)
+        ).first()
+        if query is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Title not found.",
+            )
+        return self.serialize_rows([query])[0]
+
+    def get_titles_by_ids(self, user: models.User, ids: List[int]) -> dict:
+        return self.get_batch(ids, serialize=self.serialize_rows)
+
+    def serialize_rows(self, rows) -> List[dict]:
+        genres = self.genres_of([row.id for row in rows])
+        return [self._serialize(row, genres[row.id]) for row in rows]
+
+    def genres_of(self, title_ids: List[int]) -> Dict[int, List[dict]]:
+        """
+        Genres of every title in `title_ids`, in one query over the
+        association's primary key whatever the number of titles.
+        """
+        genres = defaultdict(list)
+        if not title_ids:
+            return genres
+        link = models.title_genre
         query = (
-            self.session.query(models.Title)
-            .where(models.Title.id == title_id)
-            .first()
+            select(link.c.title_id, models.Genre.name, models.Genre.slug)
+            .join(models.Genre, models.Genre.id == link.c.genre_id)
+            .where(link.c.title_id.in_(title_ids))
+            .order_by(link.c.title_id, models.Genre.slug)
         )
-        rating = (
-            self.session.query(func.avg(models.Review.score).label('rating'))
-            .filter(models.Review.title_id == title_id)
-            .scalar()
+        for title_id, name, slug in self.session.execute(query):
+            genres[title_id].append({'name': name, 'slug': slug})
+        return genres
+
+    def resolve_genres(self, genres: List[dict]) -> List[models.Genre]:
+        slugs = {genre['slug'] for genre in genres}
+        if not slugs:
+            return []
+        found = (
+            self.session.execute(
+                select(models.Genre).where(models.Genre.slug.in_(slugs))
+            )
+            .scalars()
+            .all()
         )
+        if len(found) != len(slugs):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No such Genre",
+            )
+        return found
 
-        response = jsonable_encoder(query)
-        if rating:
-            response.update({'rating': round(rating, 2)})
-        return response
+    @staticmethod
+    def _serialize(row, genres: List[dict]) -> dict:
+        category = None
+        if row.category_slug is not None:
+            category = {'name': row.category_name, 'slug': row.category_slug}
+        return {
+            'name': row.name,
+            'year': row.year,
+            'description': row.description,
+            'category': category,
+            'genres': genres,
+            'rating': round(row.rating, 2) if row.rating is not None else None,
+        }
 
     def create_title(self, data: TitleBase, user: models.User) -> models.Title:
         data = data.dict()
@@ -73,9 +207,13 @@ class TitleService:
                 detail="No such Category",
             )
         data['category'] = category
+        data['genres'] = self.resolve_genres(data.pop('genres'))
         title = models.Title(**data)
         self.session.add(title)
-        self.session.commit()
+        bump_versions(self.session, TITLES)
+        self.flush_unique("Title already exist")
+        reindex(self.session, title_search, models.Title.id == title.id)
+        self.commit_unique("Title already exist")
         self.session.refresh(title)
         return title
 
@@ -101,10 +239,15 @@ class TitleService:
                     detail="No such Category",
                 )
             data['category_id'] = category.id
+        if 'genres' in data:
+            title.genres = self.resolve_genres(data.pop('genres'))
         for key, value in data.items():
             setattr(title, key, value)
         self.session.add(title)
-        self.session.commit()
+        bump_versions(self.session, TITLES, title_version(title_id))
+        self.flush_unique("Title already exist")
+        reindex(self.session, title_search, models.Title.id == title_id)
+        self.commit_unique("Title already exist")
         self.session.refresh(title)
         return title
 
@@ -119,6 +262,89 @@ class TitleService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Title not found.",
             )
+        reviews = select(models.Review.id).where(
+            models.Review.title_id == title_id
+        )
+        review_ids = self.session.execute(reviews).scalars().all()
+        comments = select(models.Comment.id).where(
+            models.Comment.review_id.in_(review_ids)
+        )
+        unindex(self.session, comment_search, comments)
+        unindex(self.session, review_search, review_ids)
+        unindex(self.session, title_search, [title_id])
+        self.session.execute(
+            delete(models.Comment)
+            .where(models.Comment.review_id.in_(reviews))
+            .execution_options(synchronize_session=False)
+        )
+        self.session.execute(
+            delete(models.Review).where(models.Review.title_id == title_id)
+        )
+        self.session.execute(
+            delete(models.TitleActivity).where(
+                models.TitleActivity.title_id == title_id
+            )
+        )
         self.session.delete(query)
+        bump_versions(
+            self.session,
+            TITLES,
+            title_version(title_id),
+            reviews_version(title_id),
+            *map(comments_version, review_ids),
+        )
         self.session.commit()
         return None
+
+
+class AsyncTitleService(AsyncCRUDBase[models.Title]):
+    sync_service = TitleService
+
+    def __init__(self, session: AsyncSession = Depends(get_db)):
+        self.session = session
+        self.model = models.Title
+
+    async def get_titles(
+        self,
+        user: models.User,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        filters: Optional[TitleFilter] = None,
+        sort: TitleSort = TitleSort.ID,
+    ) -> dict:
+        return await self.run_sync(
+            TitleService.get_titles,
+            user,
+            cursor=cursor,
+            limit=limit,
+            filters=filters,
+            sort=sort,
+        )
+
+    async def get_title_by_id(self, user: models.User, title_id: int):
+        return await self.run_sync(
+            TitleService.get_title_by_id, user, title_id
+        )
+
+    async def create_title(
+        self, data: TitleBase, user: models.User
+    ) -> TitleBase:
+        return await self.run_sync(
+            TitleService.create_title, data, user, response_model=TitleBase
+        )
+
+    async def edit_title(
+        self, data: TitleBase, user: models.User, title_id: int
+    ) -> TitleBase:
+        return await self.run_sync(
+            TitleService.edit_title,
+            data,
+            user,
+            title_id,
+            response_model=TitleBase,
+        )
+
+    async def delete_title_by_id(self, user: models.User, title_id: int):
+        return await self.run_sync(
+            TitleService.delete_title_by_id, user, title_id
+        )
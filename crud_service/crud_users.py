@@ -1,37 +1,61 @@
 from typing import Any, List, Optional
 
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from models import models
+from models.async_db import get_db
 from models.database import get_session
 from schemas.user import (
     Roles,
     TokenRequest,
     UserPatchInput,
+    UserSerializer,
     UserSerializerInput,
 )
 from services.utils import (
     create_access_token,
     get_hashed_password,
+    user_cache,
     verify_password,
 )
+from .crud_base import DEFAULT_PAGE_SIZE, AsyncCRUDBase, CRUDBase
 
 
-class UserService:
+class UserService(CRUDBase[models.User]):
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
+        self.model = models.User
 
     def get_list_users(
         self,
         user: models.User,
         roles: Optional[Roles] = None,
-    ) -> List[models.User]:
-        query = self.session.query(models.User)
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> dict:
+        query = self.list_statement()
         if roles:
-            query = query.filter_by(role=roles)
-        users = query.all()
-        return users
+            query = query.where(models.User.role == roles)
+        page = self.paginate(query, cursor=cursor, limit=limit)
+        page['results'] = [row._asdict() for row in page['results']]
+        return page
+
+    def list_statement(self) -> Select:
+        return select(
+            models.User.id,
+            models.User.username,
+            models.User.first_name,
+            models.User.last_name,
+            models.User.email,
+            models.User.role,
+        )
+
+    def get_users_by_ids(self, user: models.User, ids: List[int]) -> dict:
+        return self.get_batch(ids)
 
     def get_user(self, user: models.User, username: str):
         query = (
@@ -72,7 +96,7 @@ class UserService:
         user_data['hashed_password'] = get_hashed_password(password)
         user = models.User(**user_data)
         self.session.add(user)
-        self.session.commit()
+        self.commit_unique("User with this username already exist")
         self.session.refresh(user)
         user.__dict__['password'] = 'hided'
         return user
@@ -84,7 +108,7 @@ class UserService:
         user = (
             self.session.query(models.User)
             .filter(models.User.id == logged_user.id)
-            .update(update_user_data, synchronize_session=False)
+            .update(update_user_data)
         )
         user = (
             self.session.query(models.User)
@@ -92,6 +116,7 @@ class UserService:
             .first()
         )
         self.session.commit()
+        user_cache.invalidate(logged_user.id)
         return user
 
     def validate_user_fields(self, user_data: UserSerializerInput) -> bool:
@@ -144,3 +169,41 @@ class TokenService:
             "access_token": create_access_token(token_payload),
             "token_type": "bearer",
         }
+
+
+class AsyncUserService(AsyncCRUDBase[models.User]):
+    sync_service = UserService
+
+    def __init__(self, session: AsyncSession = Depends(get_db)):
+        self.session = session
+        self.model = models.User
+
+    async def get_list_users(
+        self,
+        user: models.User,
+        roles: Optional[Roles] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> dict:
+        return await self.run_sync(
+            UserService.get_list_users,
+            user,
+            roles=roles,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    async def get_user(self, user: models.User, username: str):
+        return await self.run_sync(
+            UserService.get_user, user, username, response_model=UserSerializer
+        )
+
+    async def patch_user(
+        self, user_data: UserPatchInput, logged_user: models.User
+    ) -> UserSerializer:
+        return await self.run_sync(
+            UserService.patch_user,
+            user_data,
+            logged_user,
+            response_model=UserSerializer,
+        )
@@ -0,0 +1,198 @@
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from fastapi import Depends, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import models
+from models.async_db import get_db
+from models.database import get_session
+from services.http_cache import check_conditional, raise_if_not_modified
+from services.response_cache import CachedResponse, cache_key, response_cache
+from .crud_base import AsyncCRUDBase, CRUDBase
+
+CATEGORIES = 'categories'
+GENRES = 'genres'
+TITLES = 'titles'
+
+# names bumped by the open transaction, invalidated once it commits
+PENDING_TAGS = 'pending_cache_tags'
+
+
+def title_version(title_id: int) -> str:
+    return f'title:{title_id}'
+
+
+def reviews_version(title_id: int) -> str:
+    return f'reviews:{title_id}'
+
+
+def comments_version(review_id: int) -> str:
+    return f'comments:{review_id}'
+
+
+def bump_versions(session: Session, *names: str):
+    """
+    Increment the change counters of `names`.
+
+    Runs in the caller's transaction, the caller commits. The names double
+    as response cache tags, evicted after the commit.
+    """
+    names = set(names)
+    if not names:
+        return
+    table = models.ResourceVersion.__table__
+    connection = session.connection()
+    now = datetime.utcnow()
+    existing = set(
+        connection.execute(
+            select(table.c.name).where(table.c.name.in_(names))
+        ).scalars()
+    )
+    if existing:
+        connection.execute(
+            update(table)
+            .where(table.c.name.in_(existing))
+            .values(version=table.c.version + 1, updated_at=now)
+        )
+    if names - existing:
+        connection.execute(
+            insert(table),
+            [
+                {'name': name, 'version': 1, 'updated_at': now}
+                for name in names - existing
+            ],
+        )
+    session.info.setdefault(PENDING_TAGS, set()).update(names)
+
+
+def bump_prefixed_versions(session: Session, prefix: str):
+    """
+    Increment every counter whose name starts with `prefix`.
+    """
+    table = models.ResourceVersion.__table__
+    prefixed = table.c.name.startswith(prefix, autoescape=True)
+    connection = session.connection()
+    names = connection.execute(select(table.c.name).where(prefixed)).scalars()
+    session.info.setdefault(PENDING_TAGS, set()).update(names)
+    connection.execute(
+        update(table)
+        .where(prefixed)
+        .values(version=table.c.version + 1, updated_at=datetime.utcnow())
+    )
+
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_committed(session: Session):
+    tags = session.info.pop(PENDING_TAGS, None)
+    if tags:
+        response_cache.invalidate(tags)
+
+
+@event.listens_for(Session, 'after_rollback')
+def forget_rolled_back(session: Session):
+    session.info.pop(PENDING_TAGS, None)
+
+
+class VersionService(CRUDBase[models.ResourceVersion]):
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+        self.model = models.ResourceVersion
+
+    def get_versions(
+        self, *names: str
+    ) -> Dict[str, Tuple[int, Optional[datetime]]]:
+        rows = self.session.execute(
+            select(
+                self.model.name, self.model.version, self.model.updated_at
+            ).where(self.model.name.in_(names))
+        ).all()
+        versions = {name: (0, None) for name in names}
+        for row in rows:
+            versions[row.name] = (row.version, row.updated_at)
+        return versions
+
+    def conditional(self, request: Request, *names: str) -> dict:
+        """
+        Validator and Cache-Control headers for a read of `names`.
+
+        Raises NotModified when the request's validators still match, so
+        the endpoint skips its queries entirely.
+        """
+        return check_conditional(request, self.get_versions(*names))
+
+    def cached(
+        self,
+        request: Request,
+        names: Sequence[str],
+        fetch: Callable[[], Any],
+        key_suffix: str = '',
+    ) -> Response:
+        """
+        Serve a catalogue read from the response cache, tagged by `names`.
+
+        A warm hit is answered, or turned into a 304, without any SQL. On a
+        miss the versions are checked and `fetch` renders the payload.
+        `key_suffix` is added to the cache key, for payloads depending on
+        more than the URL.
+        """
+        key = cache_key(request, key_suffix)
+        hit = _cached_hit(request, key)
+        if hit is not None:
+            return hit
+        epochs = response_cache.epochs(names)
+        headers = self.conditional(request, *names)
+        response = ORJSONResponse(fetch(), headers=headers)
+        _store(key, response, headers, names, epochs)
+        return response
+
+
+def _cached_hit(request: Request, key: str) -> Optional[Response]:
+    entry = response_cache.get(key)
+    if entry is None:
+        return None
+    raise_if_not_modified(request, entry.headers)
+    return entry.response()
+
+
+def _store(
+    key: str,
+    response: Response,
+    headers: dict,
+    names: Sequence[str],
+    epochs: Tuple[int, ...],
+):
+    response_cache.set(
+        key, CachedResponse(response.body, headers), names, epochs
+    )
+
+
+class AsyncVersionService(AsyncCRUDBase[models.ResourceVersion]):
+    sync_service = VersionService
+
+    def __init__(self, session: AsyncSession = Depends(get_db)):
+        self.session = session
+        self.model = models.ResourceVersion
+
+    async def conditional(self, request: Request, *names: str) -> dict:
+        return await self.run_sync(VersionService.conditional, request, *names)
+
+    async def cached(
+        self,
+        request: Request,
+        names: Sequence[str],
+        fetch: Callable[[], Awaitable[Any]],
+        key_suffix: str = '',
+    ) -> Response:
+        key = cache_key(request, key_suffix)
+        hit = _cached_hit(request, key)
+        if hit is not None:
+            return hit
+        epochs = response_cache.epochs(names)
+        headers = await self.conditional(request, *names)
+        response = ORJSONResponse(await fetch(), headers=headers)
+        _store(key, response, headers, names, epochs)
+        return response
@@ -1,31 +1,91 @@
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
 
 from services.config import settings
+from .database import (
+    READ_METHODS,
+    configure_sqlite,
+    engine_options,
+    read_only_pragmas,
+    read_only_url,
+    splits_reads,
+)
+from .pools import TimedAsyncAdaptedQueuePool, register_pool
 
-# TODO asyncio postgresql
-
-# SQLALCHEMY_DATABASE_URL = settings.DB
-
-# engine = create_engine(
-#     SQLALCHEMY_DATABASE_URL,echo=True
-# )
-
-
-engine = create_async_engine('sqlite+aiosqlite:///db.sqlite3', echo=True)
+primary_url = make_url(settings.async_database_url)
+engine = create_async_engine(
+    primary_url,
+    **engine_options(
+        primary_url,
+        settings.database_pool_size,
+        settings.database_max_overflow,
+        TimedAsyncAdaptedQueuePool,
+    ),
+)
+register_pool('async_primary', configure_sqlite(engine.sync_engine))
+if splits_reads(primary_url, settings.async_read_database_url):
+    read_url = make_url(
+        settings.async_read_database_url or read_only_url(primary_url)
+    )
+    read_engine = create_async_engine(
+        read_url,
+        **engine_options(
+            read_url,
+            settings.read_pool_size,
+            settings.read_max_overflow,
+            TimedAsyncAdaptedQueuePool,
+        ),
+    )
+    register_pool(
+        'async_read',
+        configure_sqlite(read_engine.sync_engine, read_only_pragmas()),
+    )
+else:
+    read_engine = engine
 
 session_local = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
+    engine,
+    autocommit=False,
+    autoflush=False,
+    class_=AsyncSession,
+)
+read_session_local = sessionmaker(
+    read_engine,
+    autocommit=False,
+    autoflush=False,
+    class_=AsyncSession,
 )
 
-Base = declarative_base()
+
+async def dispose():
+    """
+    Close the pooled connections, each holds an aiosqlite worker thread
+    that keeps the process alive.
+    """
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
-async def get_db() -> AsyncSession:
+async def get_db(request: Request) -> AsyncSession:
     """
-    Get db to create session
+    Get db to create session, on the read pool for GET, HEAD and OPTIONS.
+    Shared by every dependency of the request as in `get_session`.
     :return Session:
     """
-    async with session_local() as session:
+    session = getattr(request.state, 'async_db_session', None)
+    if session is not None:
         yield session
+        return
+    if request.method in READ_METHODS:
+        factory = read_session_local
+    else:
+        factory = session_local
+    async with factory() as session:
+        request.state.async_db_session = session
+        try:
+            yield session
+        finally:
+            del request.state.async_db_session
@@ -1,27 +1,186 @@
+import os
+from typing import Union
+
 from sqlalchemy import (
     create_engine,
+    event,
 )
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
 
 from services.config import settings
+from .pools import TimedQueuePool, register_pool
+
+MEMORY = (None, '', ':memory:')
+READ_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+def sqlite_pragmas() -> dict:
+    """
+    Connection pragmas from the settings, unset ones are left out.
+    """
+    pragmas = {
+        'journal_mode': settings.sqlite_journal_mode,
+        'synchronous': settings.sqlite_synchronous,
+        'busy_timeout': settings.sqlite_busy_timeout,
+        'mmap_size': settings.sqlite_mmap_size,
+        'cache_size': settings.sqlite_cache_size,
+        'temp_store': settings.sqlite_temp_store,
+    }
+    return {
+        name: value
+        for name, value in pragmas.items()
+        if value is not None and value != ''
+    }
+
+
+def configure_sqlite(engine: Engine, pragmas: dict = None) -> Engine:
+    """
+    Run `pragmas`, by default `sqlite_pragmas()`, on every connection the
+    engine opens; engines of other backends are returned untouched. For an
+    async engine pass its `sync_engine`.
+    """
+    if engine.dialect.name != 'sqlite':
+        return engine
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+
+    return engine
+
+
+def read_only_pragmas() -> dict:
+    # journal_mode is a write, read-only connections use the file's mode
+    pragmas = sqlite_pragmas()
+    pragmas.pop('journal_mode', None)
+    return pragmas
+
+
+def read_only_url(url: Union[str, URL]) -> URL:
+    """
+    URL opening the sqlite file of `url` read-only; in-memory databases
+    and other backends come back unchanged.
+    """
+    url = make_url(url)
+    if url.get_backend_name() != 'sqlite' or url.database in MEMORY:
+        return url
+    if url.query.get('uri') == 'true':
+        return url.update_query_dict({'mode': 'ro'})
+    return url.set(
+        database=f'file:{os.path.abspath(url.database)}',
+        query={**url.query, 'mode': 'ro', 'uri': 'true'},
+    )
+
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False},
+def engine_options(
+    url: URL, pool_size: int, max_overflow: int, poolclass=TimedQueuePool
+) -> dict:
+    """
+    Keyword arguments of create_engine for `url`, pooled by `poolclass`
+    with the pool settings. A sqlite file would get a NullPool, opening a
+    connection per checkout; it is pooled like the server backends.
+    """
+    options = {}
+    if url.get_backend_name() == 'sqlite':
+        options['connect_args'] = {"check_same_thread": False}
+        if url.database in MEMORY:
+            return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        pool_pre_ping=settings.database_pool_pre_ping,
+    )
+    return options
+
+
+def splits_reads(url: URL, read_url: str) -> bool:
+    # an in-memory database only exists on its own connection
+    return bool(read_url) or url.database not in MEMORY
+
+
+primary_url = make_url(settings.database_url)
+engine = register_pool(
+    'primary',
+    configure_sqlite(
+        create_engine(
+            primary_url,
+            **engine_options(
+                primary_url,
+                settings.database_pool_size,
+                settings.database_max_overflow,
+            ),
+        )
+    ),
 )
+if splits_reads(primary_url, settings.read_database_url):
+    read_url = make_url(
+        settings.read_database_url or read_only_url(primary_url)
+    )
+    read_engine = register_pool(
+        'read',
+        configure_sqlite(
+            create_engine(
+                read_url,
+                **engine_options(
+                    read_url,
+                    settings.read_pool_size,
+                    settings.read_max_overflow,
+                ),
+            ),
+            read_only_pragmas(),
+        ),
+    )
+else:
+    read_engine = engine
 
 Session = sessionmaker(
     engine,
     autocommit=False,
     autoflush=False,
 )
+# sessions of safe requests, on the read pool
+ReadSession = sessionmaker(
+    read_engine,
+    autocommit=False,
+    autoflush=False,
+)
 
 
-def get_session() -> Session:
-    session = Session()
+def dispose():
+    engine.dispose()
+    if read_engine is not engine:
+        read_engine.dispose()
+
+
+def get_session(request: Request) -> Session:
+    """
+    Session of the request: GET, HEAD and OPTIONS requests only read and
+    get one from the read pool, every other method the primary.
+
+    Every dependency of the request shares the session, and with it one
+    pooled connection; dependency caching alone would give dependencies
+    under different security scopes sessions of their own. The first
+    dependency to ask opens it and closes it once the request is done.
+    """
+    session = getattr(request.state, 'db_session', None)
+    if session is not None:
+        yield session
+        return
+    factory = ReadSession if request.method in READ_METHODS else Session
+    session = request.state.db_session = factory()
     try:
         yield session
     finally:
         session.close()
-
-
+        del request.state.db_session
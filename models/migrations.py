@@ -0,0 +1,66 @@
+from sqlalchemy import exc, inspect, text
+
+from .database import engine
+from .models import Base
+from .search import create_search_index
+
+
+def add_missing_columns(bind=engine):
+    """
+    Add columns declared on the models but missing from an existing database.
+
+    `create_all` only creates absent tables, so columns introduced later
+    (e.g. the title rating aggregates) are appended with ALTER TABLE.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {
+                column['name'] for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = 'ALTER TABLE "{}" ADD COLUMN "{}" {}'.format(
+                    table.name,
+                    column.name,
+                    column.type.compile(dialect=bind.dialect),
+                )
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    default = getattr(default, 'text', default)
+                    ddl += f" DEFAULT '{default}'"
+                    if not column.nullable:
+                        ddl += ' NOT NULL'
+                conn.execute(text(ddl))
+
+
+def create_missing_indexes(bind=engine):
+    """
+    Create the indexes declared on the models that an existing database
+    lacks. Unique indexes fail if the table already holds duplicates, these
+    have to be cleaned up by hand before rerunning.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind, checkfirst=True)
+            except exc.IntegrityError as error:
+                columns = ', '.join(column.name for column in index.columns)
+                raise RuntimeError(
+                    f"Cannot create unique index {index.name}: "
+                    f"duplicate values in {table.name} ({columns})."
+                ) from error
+
+
+def migrate(bind=engine):
+    Base.metadata.create_all(bind)
+    add_missing_columns(bind)
+    create_missing_indexes(bind)
+    create_search_index(bind)
+
+
+if __name__ == "__main__":
+    migrate()
@@ -2,11 +2,15 @@ from datetime import datetime
 
 from sqlalchemy import (
     Column,
+    Date,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     SmallInteger,
     String,
+    Table,
     Text,
 )
 from sqlalchemy.ext.declarative import declarative_base
@@ -37,19 +41,23 @@ MAX_LEN_TEXT = 3
 class User(Base):
     __tablename__ = 'user'
     id = Column(Integer, primary_key=True)
-    username = Column(String(MAX_LENGTH_SHORT), nullable=False)
+    username = Column(
+        String(MAX_LENGTH_SHORT), nullable=False, unique=True, index=True
+    )
     first_name = Column(String(MAX_LENGTH_SHORT), nullable=True)
     last_name = Column(String(MAX_LENGTH_SHORT), nullable=True)
     hashed_password = Column(String(MAX_LENGTH_LONG), nullable=True)
-    email = Column(String(MAX_LENGTH_LONG), nullable=True)
+    email = Column(String(MAX_LENGTH_LONG), nullable=True, index=True)
     role = Column(String(MAX_LENGTH_SHORT), nullable=False, default='user')
 
 
 class Category(Base):
     __tablename__ = 'category'
     id = Column(Integer, primary_key=True)
-    name = Column(String(MAX_LENGTH_SHORT), nullable=False)
-    slug = Column(String(MAX_LENGTH_SHORT), nullable=False)
+    name = Column(String(MAX_LENGTH_SHORT), nullable=False, index=True)
+    slug = Column(
+        String(MAX_LENGTH_SHORT), nullable=False, unique=True, index=True
+    )
 
     def __str__(self):
         return self.name
@@ -59,24 +67,99 @@ class Genre(Base):
     __tablename__ = 'genre'
     id = Column(Integer, primary_key=True)
     name = Column(String(MAX_LENGTH_SHORT), nullable=False)
-    slug = Column(String(MAX_LENGTH_SHORT), nullable=False)
+    slug = Column(
+        String(MAX_LENGTH_SHORT), nullable=False, unique=True, index=True
+    )
 
     def __str__(self):
         return self.name
 
 
+title_genre = Table(
+    'title_genre',
+    Base.metadata,
+    Column(
+        'title_id',
+        Integer,
+        ForeignKey('title.id', ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        'genre_id',
+        Integer,
+        ForeignKey('genre.id', ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    # the primary key serves genres of a title, this one titles of a genre
+    Index('ix_title_genre_genre_id_title_id', 'genre_id', 'title_id'),
+)
+
+
 class Title(Base):
     __tablename__ = 'title'
+    __table_args__ = (
+        # listing filters and sort orders, id breaks ties in keyset order
+        Index('ix_title_category_id_rating', 'category_id', 'rating', 'id'),
+        Index('ix_title_rating', 'rating', 'id'),
+        Index('ix_title_year', 'year', 'id'),
+        # review count leaderboards, overall and per category
+        Index('ix_title_review_count', 'review_count', 'id'),
+        Index(
+            'ix_title_category_id_review_count',
+            'category_id',
+            'review_count',
+            'id',
+        ),
+    )
     id = Column(Integer, primary_key=True)
-    name = Column(String(MAX_LENGTH_SHORT), nullable=False)
+    name = Column(
+        String(MAX_LENGTH_SHORT), nullable=False, unique=True, index=True
+    )
     year = Column(SmallInteger, nullable=False)
     description = Column(String(500), nullable=True)
     category_id = Column(Integer, ForeignKey('category.id'))
     category = relationship("Category", backref="titles")
+    genres = relationship("Genre", secondary=title_genre, backref="titles")
+    # aggregates of the scored reviews, kept by crud_ratings
+    review_count = Column(
+        Integer, nullable=False, default=0, server_default='0'
+    )
+    score_sum = Column(Integer, nullable=False, default=0, server_default='0')
+    rating = Column(Float, nullable=True)
+
+
+class TitleActivity(Base):
+    """
+    Reviews posted per title and week, kept in step with review writes so
+    the most reviewed titles of a week are read without scanning reviews.
+    """
+
+    __tablename__ = 'title_activity'
+    __table_args__ = (
+        # a week's titles in review count order
+        Index(
+            'ix_title_activity_week_review_count',
+            'week',
+            'review_count',
+            'title_id',
+        ),
+    )
+    title_id = Column(
+        Integer,
+        ForeignKey('title.id', ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # monday starting the week
+    week = Column(Date, primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
 
 
 class Review(Base):
     __tablename__ = 'review'
+    __table_args__ = (
+        # title listing in keyset order, also serves title_id lookups
+        Index('ix_review_title_id_pub_date', 'title_id', 'pub_date', 'id'),
+    )
     id = Column(Integer, primary_key=True)
     title_id = Column(
         Integer,
@@ -85,7 +168,7 @@ class Review(Base):
     )
     title = relationship('Title', backref='reviews')
     text = Column(Text, nullable=True)
-    author_id = Column(Integer, ForeignKey('user.id'))
+    author_id = Column(Integer, ForeignKey('user.id'), index=True)
     author = relationship('User', backref='reviews')
     score = Column(SmallInteger)
     pub_date = Column(DateTime, default=datetime.now)
@@ -99,6 +182,9 @@ class Review(Base):
 
 class Comment(Base):
     __tablename__ = 'comment'
+    __table_args__ = (
+        Index('ix_comment_review_id_pub_date', 'review_id', 'pub_date', 'id'),
+    )
     id = Column(Integer, primary_key=True)
     review_id = Column(
         Integer,
@@ -112,5 +198,21 @@ class Comment(Base):
     pub_date = Column(DateTime, default=datetime.now)
 
 
+class ResourceVersion(Base):
+    """
+    Change counter of a cacheable resource, e.g. "titles" or "title:42".
+
+    Bumped in the same transaction as the write, read to build ETags.
+    """
+
+    __tablename__ = 'resource_version'
+    name = Column(String(MAX_LENGTH_SHORT), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# registers the FTS5 tables with create_all
+from . import search  # noqa: E402,F401
+
 if __name__ == "__main__":
     init_db()
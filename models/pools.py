@@ -0,0 +1,99 @@
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class TimedPool:
+    """
+    Queue pool mixin timing every checkout, the time spent waiting for a
+    free connection or opening a new one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._metrics_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._metrics_lock:
+                self.checkouts += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def recreate(self):
+        # dispose() swaps in a fresh pool, the totals carry over
+        pool = super().recreate()
+        with self._metrics_lock:
+            pool.checkouts = self.checkouts
+            pool.timeouts = self.timeouts
+            pool.wait_seconds = self.wait_seconds
+            pool.max_wait_seconds = self.max_wait_seconds
+        return pool
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            return {
+                'size': self.size(),
+                'max_overflow': self._max_overflow,
+                'checked_in': self.checkedin(),
+                'checked_out': self.checkedout(),
+                'overflow': max(0, self.overflow()),
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_seconds': self.wait_seconds,
+                'max_wait_seconds': self.max_wait_seconds,
+            }
+
+
+class TimedQueuePool(TimedPool, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+# pool name -> engine, reported by pool_stats
+pools: Dict[str, Engine] = {}
+connects: Dict[str, int] = {}
+
+
+def register_pool(name: str, engine: Engine) -> Engine:
+    """
+    Report the pool of `engine` (a sync engine, or an async engine's
+    `sync_engine`) in `pool_stats` under `name`.
+    """
+    pools[name] = engine
+    connects.setdefault(name, 0)
+
+    @event.listens_for(engine, 'connect')
+    def count_connect(dbapi_connection, connection_record):
+        connects[name] += 1
+
+    return engine
+
+
+def pool_stats() -> Dict[str, dict]:
+    stats = {}
+    for name, engine in pools.items():
+        pool = engine.pool
+        stats[name] = {'pool': type(pool).__name__, 'connects': connects[name]}
+        if isinstance(pool, TimedPool):
+            stats[name].update(pool.metrics())
+    return stats
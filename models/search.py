@@ -0,0 +1,82 @@
+from sqlalchemy import (
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    event,
+    inspect,
+    text,
+)
+
+from .models import Base
+
+# FTS5 virtual tables, described for query building only: they stay out of
+# Base.metadata so create_all never makes them plain tables.
+search_metadata = MetaData()
+
+TOKENIZE = "unicode61 remove_diacritics 2"
+
+
+def search_table(name: str, *columns: str) -> Table:
+    return Table(
+        name,
+        search_metadata,
+        Column('rowid', Integer, primary_key=True),
+        *(Column(column, Text) for column in columns),
+        # hidden FTS5 column, bm25 of the row for the current MATCH
+        Column('rank', Float),
+    )
+
+
+title_search = search_table('title_search', 'name', 'description')
+review_search = search_table('review_search', 'text')
+comment_search = search_table('comment_search', 'text')
+
+# search table -> (source table, indexed columns)
+SEARCH_SOURCES = {
+    title_search: ('title', ('name', 'description')),
+    review_search: ('review', ('text',)),
+    comment_search: ('comment', ('text',)),
+}
+
+
+def create_search_index(bind):
+    """
+    Create the missing FTS5 tables and fill them from their source tables.
+
+    The tables copy the indexed text (no external content), so rows can be
+    dropped by rowid alone. Only sqlite has FTS5, other backends are
+    skipped.
+    """
+    if bind.dialect.name != 'sqlite':
+        return
+    with bind.begin() as conn:
+        _create_missing(conn)
+
+
+def _create_missing(conn):
+    existing = set(inspect(conn).get_table_names())
+    for table, (source, columns) in SEARCH_SOURCES.items():
+        if table.name in existing:
+            continue
+        names = ', '.join(columns)
+        conn.execute(
+            text(
+                f"CREATE VIRTUAL TABLE {table.name} USING fts5("
+                f"{names}, tokenize='{TOKENIZE}')"
+            )
+        )
+        conn.execute(
+            text(
+                f"INSERT INTO {table.name} (rowid, {names}) "
+                f"SELECT id, {names} FROM {source}"
+            )
+        )
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def create_search_tables(target, connection, **kw):
+    if connection.dialect.name == 'sqlite':
+        _create_missing(connection)
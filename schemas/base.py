@@ -0,0 +1,20 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic.generics import GenericModel
+
+ItemType = TypeVar('ItemType')
+
+
+class Page(GenericModel, Generic[ItemType]):
+    results: List[ItemType]
+    next_cursor: Optional[str] = None
+
+
+class BatchItem(GenericModel, Generic[ItemType]):
+    id: int
+    found: bool
+    data: Optional[ItemType] = None
+
+
+class Batch(GenericModel, Generic[ItemType]):
+    results: List[BatchItem[ItemType]]
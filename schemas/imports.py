@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, conint, constr, root_validator, validator
+
+from models.models import MAX_LENGTH_SHORT
+
+ShortStr = constr(
+    strip_whitespace=True, min_length=1, max_length=MAX_LENGTH_SHORT
+)
+
+
+class SluggedRow(BaseModel):
+    name: ShortStr
+    slug: ShortStr
+
+
+class TitleRow(BaseModel):
+    name: ShortStr
+    year: int
+    description: Optional[constr(max_length=500)] = None
+    category: Optional[str] = None
+    genres: List[str] = []
+
+    @validator('genres', pre=True)
+    def split_genres(cls, value):
+        # csv cells hold the genre slugs comma separated, an empty cell
+        # is read as None
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [slug.strip() for slug in value.split(',') if slug.strip()]
+        return value
+
+
+class ReviewRow(BaseModel):
+    title: Optional[str] = None
+    title_id: Optional[int] = None
+    author: str
+    text: str
+    score: conint(ge=1, le=10)
+    pub_date: Optional[datetime] = None
+
+    @root_validator(skip_on_failure=True)
+    def title_given(cls, values):
+        if values.get('title') is None and values.get('title_id') is None:
+            raise ValueError("title or title_id is required")
+        return values
+
+
+class RowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    imported: int
+    error_count: int
+    errors: List[RowError]
@@ -0,0 +1,21 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .schemas import Category
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    id: int
+    name: str
+    year: int
+    category: Optional[Category]
+    rating: Optional[float]
+    review_count: int
+    week_reviews: Optional[int]
+
+
+class Leaderboard(BaseModel):
+    kind: str
+    results: List[LeaderboardEntry]
@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Optional, Union
+from enum import Enum
+from typing import List, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, confloat
 
 
 class Category(BaseModel):
@@ -13,12 +14,22 @@ class Category(BaseModel):
         orm_mode = True
 
 
+class Genre(BaseModel):
+
+    name: str
+    slug: str
+
+    class Config:
+        orm_mode = True
+
+
 class TitleBase(BaseModel):
 
     name: str
     year: int
     description: Optional[str] = None
     category: Union[Category, None] = None
+    genres: List[Genre] = []
 
     class Config:
         orm_mode = True
@@ -28,6 +39,25 @@ class Title(TitleBase):
     rating: Union[float, None]
 
 
+class TitleSort(str, Enum):
+    ID = 'id'
+    NAME = 'name'
+    NAME_DESC = '-name'
+    YEAR = 'year'
+    YEAR_DESC = '-year'
+    RATING = 'rating'
+    RATING_DESC = '-rating'
+
+
+class TitleFilter(BaseModel):
+    category: Optional[str] = None
+    genre: Optional[str] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    name_prefix: Optional[str] = None
+    min_rating: Optional[confloat(ge=1, le=10)] = None
+
+
 class ReviewBase(BaseModel):
     text: str
     score: int
@@ -45,6 +75,10 @@ class Review(ReviewBase):
         orm_mode = True
 
 
+class TitleReview(Review):
+    title_id: int
+
+
 class CommentIn(BaseModel):
     text: str
 
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class TitleHit(BaseModel):
+    id: int
+    name: str
+    year: int
+    rating: Optional[float]
+    snippet: str
+
+
+class ReviewHit(BaseModel):
+    id: int
+    title_id: int
+    score: int
+    pub_date: datetime
+    author: str
+    snippet: str
+
+
+class CommentHit(BaseModel):
+    id: int
+    review_id: int
+    title_id: int
+    pub_date: datetime
+    author: str
+    snippet: str
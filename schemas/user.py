@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Union
+from typing import Optional, Union
 
 from pydantic import BaseModel
 
@@ -32,6 +32,24 @@ class UserSerializer(UserBase):
         orm_mode = True
 
 
+class UserPrincipal(BaseModel):
+    """
+    Immutable snapshot of the authenticated user, safe to share between
+    requests and sessions.
+    """
+
+    id: int
+    username: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    role: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+        allow_mutation = False
+
+
 class UserPatchInput(BaseModel):
     first_name: Union[str, None] = None
     last_name: Union[str, None] = None
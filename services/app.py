@@ -1,6 +1,44 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
+from fastapi.responses import ORJSONResponse
 
 from api import router
+from models import async_db, database
+from models.pools import pools
+from services.config import settings
+from services.http_cache import NotModified, not_modified_handler
+from services.metrics import (
+    CONTENT_TYPE,
+    MetricsMiddleware,
+    check_scrape_token,
+    render,
+)
+from services.query_stats import QueryStatsMiddleware, instrument
 
-app = FastAPI()
+instrument(*pools.values())
+
+app = FastAPI(default_response_class=ORJSONResponse)
 app.include_router(router)
+app.add_exception_handler(NotModified, not_modified_handler)
+if settings.metrics_token:
+    # added first so it runs inside QueryStatsMiddleware and sees its stats
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(
+    QueryStatsMiddleware, server_timing=settings.server_timing
+)
+
+
+@app.on_event('shutdown')
+async def dispose_engines():
+    database.dispose()
+    await async_db.dispose()
+
+
+if settings.metrics_token:
+
+    @app.get(
+        '/metrics',
+        include_in_schema=False,
+        dependencies=[Depends(check_scrape_token)],
+    )
+    def metrics():
+        return Response(render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after `ttl` seconds.
+
+    Thread safe; `stats()` reports hits and misses for the metrics.
+
+    Each key has a generation that `invalidate` moves. A reader takes it
+    with `generation()` before loading the value and passes it to `set`,
+    which drops the value if the key was invalidated meanwhile, so a value
+    read before a concurrent write never outlives that write.
+
+    `on_drop(key, value)` runs, under the cache's lock, for every entry
+    that expires, is evicted, replaced, deleted or invalidated; `clear`
+    does not call it.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        on_drop: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_drop = on_drop
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, key: Hashable) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        generation: Optional[int] = None,
+    ):
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if (
+                generation is not None
+                and self._generations.get(key, 0) != generation
+            ):
+                return
+            self._drop(key)
+            self._data[key] = (expires, value)
+            while len(self._data) > self.maxsize:
+                self._drop(next(iter(self._data)))
+
+    def delete(self, key: Hashable):
+        """
+        Drop the entry of `key`, leaving its generation alone.
+        """
+        with self._lock:
+            self._drop(key)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+    def _drop(self, key: Hashable):
+        entry = self._data.pop(key, None)
+        if entry is not None and self.on_drop is not None:
+            self.on_drop(key, entry[1])
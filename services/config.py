@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 from dotenv import load_dotenv
 from pydantic import BaseSettings
@@ -18,6 +19,56 @@ class Settings(BaseSettings):
     server_host: str = "127.0.0.1"
     server_port: int = 8000
     database_url: str = 'sqlite:///db.sqlite3'
+    # serve the API with async endpoints on the aiosqlite engine
+    async_mode: bool = False
+    async_database_url: str = 'sqlite+aiosqlite:///db.sqlite3'
+    # GET requests read through a pool of their own: a replica URL, or by
+    # default read-only connections to the sqlite file of the database url
+    read_database_url: str = ''
+    async_read_database_url: str = ''
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    read_pool_size: int = 10
+    read_max_overflow: int = 10
+    # seconds a request waits for a free connection before failing
+    database_pool_timeout: float = 30.0
+    # reopen connections older than this many seconds, -1 never
+    database_pool_recycle: int = -1
+    # test connections on checkout, for servers that drop idle ones
+    database_pool_pre_ping: bool = False
+    # authenticated user principals kept in process, keyed by user id
+    user_cache_size: int = 10_000
+    user_cache_ttl: float = 60.0
+    # verified bearer tokens, an entry never outlives the token's exp
+    token_cache_size: int = 10_000
+    token_cache_ttl: float = 300.0
+    # bcrypt process pool; calls beyond workers + max_pending get a 503
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 8
+    # catalogue reads carry an ETag; caches may store them but revalidate
+    catalogue_cache_control: str = 'public, no-cache'
+    # rendered catalogue reads: 'memory', 'redis' or 'none'
+    response_cache_backend: str = 'memory'
+    response_cache_size: int = 10_000
+    response_cache_ttl: float = 300.0
+    response_cache_url: str = 'redis://localhost:6379/0'
+    # pragmas run on every new sqlite connection, an empty value keeps the
+    # sqlite default; WAL lets readers run alongside the single writer
+    sqlite_journal_mode: str = 'wal'
+    sqlite_synchronous: str = 'normal'
+    # milliseconds a writer waits for the lock before "database is locked"
+    sqlite_busy_timeout: Optional[int] = 5000
+    sqlite_mmap_size: Optional[int] = 256 * 1024 * 1024
+    # negative values are KiB, positive ones pages
+    sqlite_cache_size: Optional[int] = -64 * 1024
+    sqlite_temp_store: str = 'memory'
+    # log statements slower than this many milliseconds, 0 disables
+    slow_query_ms: float = 200.0
+    # report each request's query count and time in a Server-Timing header
+    server_timing: bool = True
+    # GET /metrics is only served when set, to scrapers sending it as
+    # "Authorization: Bearer <token>"
+    metrics_token: str = ''
 
 
 settings = Settings()
@@ -0,0 +1,87 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from passlib.context import CryptContext
+
+password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return password_context.hash(password)
+
+
+def check_password(password: str, hashed_pass: str) -> bool:
+    return password_context.verify(password, hashed_pass)
+
+
+class HashingPoolBusy(Exception):
+    """
+    Raised when every worker is busy and the pending queue is full.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool.
+
+    At most `workers + max_pending` calls are admitted at once, the rest are
+    rejected immediately instead of piling up request threads, so a login
+    storm only degrades the login endpoints. With `workers=0` hashing runs
+    inline in the calling thread.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.in_flight = 0
+        self.rejected = 0
+        self.completed = 0
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max(1, workers) + max_pending)
+        self._lock = threading.Lock()
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password, password)
+
+    def verify(self, password: str, hashed_pass: str) -> bool:
+        return self._run(check_password, password, hashed_pass)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'in_flight': self.in_flight,
+                'queued': max(0, self.in_flight - max(1, self.workers)),
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
+
+    def _run(self, func: Callable[..., Any], *args) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingPoolBusy()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            if self.workers <= 0:
+                return func(*args)
+            return self._get_executor().submit(func, *args).result()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a threaded server process is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            return self._executor
@@ -0,0 +1,103 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response, status
+
+from services.config import settings
+
+
+class NotModified(Exception):
+    """
+    The client's cached representation is current, answer 304.
+    """
+
+    def __init__(self, headers: dict):
+        self.headers = headers
+
+
+def etag(versions: Dict[str, Tuple[int, Optional[datetime]]]) -> str:
+    raw = ';'.join(
+        f'{name}={version}' for name, (version, _) in sorted(versions.items())
+    )
+    return '"{}"'.format(
+        hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+    )
+
+
+def last_modified(
+    versions: Dict[str, Tuple[int, Optional[datetime]]]
+) -> Optional[datetime]:
+    stamps = [stamp for _, stamp in versions.values() if stamp is not None]
+    if not stamps:
+        return None
+    return max(stamps).replace(microsecond=0, tzinfo=timezone.utc)
+
+
+def etag_matches(header: str, current: str) -> bool:
+    # If-None-Match uses the weak comparison
+    candidates = {tag.strip() for tag in header.split(',')}
+    if '*' in candidates:
+        return True
+    return current in {
+        tag[2:] if tag.startswith('W/') else tag for tag in candidates
+    }
+
+
+def not_modified_since(header: str, modified: Optional[str]) -> bool:
+    if not header or modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return parsedate_to_datetime(modified) <= since
+
+
+def validators(versions: Dict[str, Tuple[int, Optional[datetime]]]) -> dict:
+    """
+    ETag, Last-Modified and Cache-Control of a representation built from
+    `versions`.
+    """
+    headers = {
+        'ETag': etag(versions),
+        'Cache-Control': settings.catalogue_cache_control,
+    }
+    modified = last_modified(versions)
+    if modified is not None:
+        headers['Last-Modified'] = format_datetime(modified, usegmt=True)
+    return headers
+
+
+def raise_if_not_modified(request: Request, headers: dict):
+    """
+    Raise NotModified when If-None-Match (or, without it,
+    If-Modified-Since) shows the client already holds the representation
+    described by `headers`.
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        if etag_matches(if_none_match, headers['ETag']):
+            raise NotModified(headers)
+    elif not_modified_since(
+        request.headers.get('if-modified-since'),
+        headers.get('Last-Modified'),
+    ):
+        raise NotModified(headers)
+
+
+def check_conditional(
+    request: Request, versions: Dict[str, Tuple[int, Optional[datetime]]]
+) -> dict:
+    headers = validators(versions)
+    raise_if_not_modified(request, headers)
+    return headers
+
+
+async def not_modified_handler(request: Request, error: NotModified):
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=error.headers
+    )
@@ -0,0 +1,409 @@
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from fastapi import Header, HTTPException, status
+
+from models.pools import pool_stats
+from services.config import settings
+from services.query_stats import current_stats
+from services.response_cache import response_cache
+from services.routes import route_template
+from services.utils import password_hasher, token_cache, user_cache
+
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+# seconds, the upper bounds of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class Shard:
+    """
+    Counters written by a single thread, so updates take no lock.
+    """
+
+    __slots__ = ('in_flight', 'latency', 'responses', 'queries', 'db_time')
+
+    def __init__(self):
+        self.in_flight = 0
+        # (method, route) -> [count per bucket..., +Inf count, sum]
+        self.latency: Dict[Tuple[str, str], List[float]] = {}
+        self.responses: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.queries: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.db_time: Dict[Tuple[str, str], float] = defaultdict(float)
+
+
+class RequestMetrics:
+    """
+    Request latency, status and database counters.
+
+    Each thread recording requests, in practice the event loop's, owns a
+    shard it updates without locking; a scrape adds the shards up. A
+    shard outlives its thread so its totals never go backwards.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._local = threading.local()
+        self._shards: List[Shard] = []
+        self._lock = threading.Lock()
+
+    def shard(self) -> Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def observe(
+        self,
+        shard: Shard,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+    ):
+        key = (method, route)
+        histogram = shard.latency.get(key)
+        if histogram is None:
+            histogram = shard.latency[key] = [0] * (len(self.buckets) + 2)
+        histogram[bisect_left(self.buckets, seconds)] += 1
+        histogram[-1] += seconds
+        shard.responses[(method, route, str(status))] += 1
+        stats = current_stats.get()
+        if stats is not None:
+            shard.queries[key] += stats.queries
+            shard.db_time[key] += stats.seconds
+
+    def collect(self) -> dict:
+        """
+        Totals of all shards. Copies are taken without the owners'
+        cooperation, a request finishing meanwhile may be half counted.
+        """
+        with self._lock:
+            shards = list(self._shards)
+        totals = {
+            'in_flight': 0,
+            'latency': {},
+            'responses': defaultdict(int),
+            'queries': defaultdict(int),
+            'db_time': defaultdict(float),
+        }
+        for shard in shards:
+            totals['in_flight'] += shard.in_flight
+            for key, histogram in shard.latency.copy().items():
+                total = totals['latency'].setdefault(
+                    key, [0] * len(histogram)
+                )
+                for index, value in enumerate(list(histogram)):
+                    total[index] += value
+            for name in ('responses', 'queries', 'db_time'):
+                for key, value in getattr(shard, name).copy().items():
+                    totals[name][key] += value
+        return totals
+
+
+request_metrics = RequestMetrics()
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, status and statement counts of every HTTP
+    request under its route template. Install it inside
+    QueryStatsMiddleware, whose stats it reads.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        shard = self.metrics.shard()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        shard.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            shard.in_flight -= 1
+            self.metrics.observe(
+                shard,
+                scope['method'],
+                route_template(scope),
+                status,
+                time.perf_counter() - start,
+            )
+
+
+def _escape(value) -> str:
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def _sample(name: str, labels: dict, value) -> str:
+    if labels:
+        pairs = ','.join(
+            f'{label}="{_escape(text)}"' for label, text in labels.items()
+        )
+        name = f'{name}{{{pairs}}}'
+    return f'{name} {value}'
+
+
+def _family(
+    name: str,
+    kind: str,
+    help_text: str,
+    samples: Iterable[Tuple[str, dict, float]],
+) -> List[str]:
+    """
+    Exposition lines of one metric; samples are (name suffix, labels,
+    value).
+    """
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+    lines.extend(
+        _sample(name + suffix, labels, value)
+        for suffix, labels, value in samples
+    )
+    return lines
+
+
+def _request_lines(metrics: RequestMetrics) -> List[str]:
+    totals = metrics.collect()
+    bounds = [*(str(bound) for bound in metrics.buckets), '+Inf']
+    latency = []
+    for (method, route), histogram in sorted(totals['latency'].items()):
+        labels = {'method': method, 'route': route}
+        cumulative = 0
+        for bound, count in zip(bounds, histogram):
+            cumulative += count
+            latency.append(('_bucket', {**labels, 'le': bound}, cumulative))
+        latency.append(('_sum', labels, histogram[-1]))
+        latency.append(('_count', labels, cumulative))
+
+    def by_route(values: dict):
+        return [
+            ('', {'method': method, 'route': route}, value)
+            for (method, route), value in sorted(values.items())
+        ]
+
+    return [
+        *_family(
+            'http_requests_in_flight',
+            'gauge',
+            'Requests being served.',
+            [('', {}, totals['in_flight'])],
+        ),
+        *_family(
+            'http_request_duration_seconds',
+            'histogram',
+            'Time to serve a request, body included.',
+            latency,
+        ),
+        *_family(
+            'http_responses_total',
+            'counter',
+            'Responses by status code.',
+            [
+                ('', {'method': method, 'route': route, 'status': code}, n)
+                for (method, route, code), n in sorted(
+                    totals['responses'].items()
+                )
+            ],
+        ),
+        *_family(
+            'db_queries_total',
+            'counter',
+            'Statements run while serving requests.',
+            by_route(totals['queries']),
+        ),
+        *_family(
+            'db_query_duration_seconds_total',
+            'counter',
+            'Time spent in statements while serving requests.',
+            by_route(totals['db_time']),
+        ),
+    ]
+
+
+def _pool_lines() -> List[str]:
+    stats = sorted(pool_stats().items())
+    families = (
+        ('db_pool_size', 'gauge', 'size', 'Connections kept open.'),
+        (
+            'db_pool_checked_out',
+            'gauge',
+            'checked_out',
+            'Connections in use.',
+        ),
+        (
+            'db_pool_overflow',
+            'gauge',
+            'overflow',
+            'Connections open beyond the pool size.',
+        ),
+        (
+            'db_pool_checkouts_total',
+            'counter',
+            'checkouts',
+            'Connections handed out.',
+        ),
+        (
+            'db_pool_timeouts_total',
+            'counter',
+            'timeouts',
+            'Checkouts that gave up waiting.',
+        ),
+        (
+            'db_pool_wait_seconds_total',
+            'counter',
+            'wait_seconds',
+            'Time spent waiting for a connection.',
+        ),
+        (
+            'db_pool_connects_total',
+            'counter',
+            'connects',
+            'Connections opened.',
+        ),
+    )
+    lines = []
+    for name, kind, key, help_text in families:
+        lines.extend(
+            _family(
+                name,
+                kind,
+                help_text,
+                [
+                    ('', {'pool': pool}, values[key])
+                    for pool, values in stats
+                    if key in values
+                ],
+            )
+        )
+    return lines
+
+
+def _cache_lines() -> List[str]:
+    caches = {
+        'response': response_cache.stats(),
+        'token': token_cache.stats(),
+        'user': user_cache.stats(),
+    }
+    ratios = []
+    for cache, stats in caches.items():
+        lookups = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / lookups if lookups else 0.0
+        ratios.append(('', {'cache': cache}, ratio))
+    return [
+        *_family(
+            'cache_hits_total',
+            'counter',
+            'Cache lookups answered from the cache.',
+            [('', {'cache': c}, s['hits']) for c, s in caches.items()],
+        ),
+        *_family(
+            'cache_misses_total',
+            'counter',
+            'Cache lookups that missed.',
+            [('', {'cache': c}, s['misses']) for c, s in caches.items()],
+        ),
+        *_family(
+            'cache_hit_ratio',
+            'gauge',
+            'Share of lookups answered from the cache since start.',
+            ratios,
+        ),
+        *_family(
+            'cache_entries',
+            'gauge',
+            'Entries held, for the caches kept in process.',
+            [
+                ('', {'cache': c}, s['size'])
+                for c, s in caches.items()
+                if 'size' in s
+            ],
+        ),
+    ]
+
+
+def _hashing_lines() -> List[str]:
+    stats = password_hasher.stats()
+    return [
+        *_family(
+            'password_hash_workers',
+            'gauge',
+            'Processes hashing passwords.',
+            [('', {}, stats['workers'])],
+        ),
+        *_family(
+            'password_hash_in_flight',
+            'gauge',
+            'Hashes running or waiting for a worker.',
+            [('', {}, stats['in_flight'])],
+        ),
+        *_family(
+            'password_hash_queue_depth',
+            'gauge',
+            'Hashes waiting for a free worker.',
+            [('', {}, stats['queued'])],
+        ),
+        *_family(
+            'password_hash_completed_total',
+            'counter',
+            'Hashes computed or verified.',
+            [('', {}, stats['completed'])],
+        ),
+        *_family(
+            'password_hash_rejected_total',
+            'counter',
+            'Hashes refused with a 503, the queue being full.',
+            [('', {}, stats['rejected'])],
+        ),
+    ]
+
+
+def render(metrics: RequestMetrics = request_metrics) -> str:
+    """
+    All metrics in the Prometheus text exposition format.
+    """
+    lines = [
+        *_request_lines(metrics),
+        *_pool_lines(),
+        *_cache_lines(),
+        *_hashing_lines(),
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def check_scrape_token(authorization: str = Header('')):
+    """
+    Let through scrapers presenting `settings.metrics_token`.
+    """
+    expected = f'Bearer {settings.metrics_token}'
+    if not settings.metrics_token or not hmac.compare_digest(
+        authorization.encode(), expected.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,168 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from services.config import settings
+from services.routes import route_template
+
+logger = logging.getLogger(__name__)
+
+# connection.info key of the start times of the running statements
+STARTED = 'query_stats_started'
+NO_REQUEST = '<no request>'
+
+
+class QueryStats:
+    """
+    Statements run on behalf of one request and the time they took.
+    """
+
+    __slots__ = ('scope', 'queries', 'seconds')
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope
+        self.queries = 0
+        self.seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        # read late, the router fills the scope after the stats are made
+        if self.scope is None:
+            return NO_REQUEST
+        return f"{self.scope['method']} {route_template(self.scope)}"
+
+    def server_timing(self) -> str:
+        return 'db;dur={:.2f};desc="{} queries"'.format(
+            self.seconds * 1000, self.queries
+        )
+
+
+current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    'current_stats', default=None
+)
+# statement lists of the running assert_max_queries blocks
+_watchers: List[List[str]] = []
+
+
+def before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    conn.info.setdefault(STARTED, []).append(time.perf_counter())
+
+
+def after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    elapsed = time.perf_counter() - conn.info[STARTED].pop()
+    stats = current_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+    for statements in _watchers:
+        statements.append(statement)
+    threshold = settings.slow_query_ms
+    if threshold > 0 and elapsed * 1000 >= threshold:
+        logger.warning(
+            'slow query %.1f ms on %s: %s',
+            elapsed * 1000,
+            stats.route if stats is not None else NO_REQUEST,
+            statement,
+        )
+
+
+def instrument(*engines: Engine):
+    """
+    Count and time the statements of `engines` (sync engines, or an async
+    engine's `sync_engine`). A statement that fails is not counted.
+    """
+    for engine in engines:
+        if not event.contains(
+            engine, 'before_cursor_execute', before_cursor_execute
+        ):
+            event.listen(
+                engine, 'before_cursor_execute', before_cursor_execute
+            )
+            event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+        # the start time of a failed statement is never popped
+        if not event.contains(engine, 'handle_error', _forget_start):
+            event.listen(engine, 'handle_error', _forget_start)
+
+
+def _forget_start(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(STARTED):
+        connection.info[STARTED].pop()
+
+
+class QueryStatsMiddleware:
+    """
+    Collects the statements of every HTTP request in a QueryStats and
+    reports their count and time in a Server-Timing header.
+
+    A plain ASGI middleware: the stats live in a context variable set for
+    the request's task, which the threadpool and the async sessions'
+    greenlets inherit. The header goes out before a streamed body, the
+    statements that body runs are not in it.
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats(scope)
+        token = current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message['type'] == 'http.response.start':
+                headers = list(message.get('headers', ()))
+                headers.append(
+                    (b'server-timing', stats.server_timing().encode())
+                )
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(
+                scope,
+                receive,
+                send_with_timing if self.server_timing else send,
+            )
+        finally:
+            current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """
+    Fail with AssertionError when the block runs more than `limit`
+    statements on the instrumented engines, listing them:
+
+        with assert_max_queries(3):
+            client.get('/api/v1/titles/')
+
+    Counts every statement, requests served by a TestClient included.
+    """
+    statements: List[str] = []
+    _watchers.append(statements)
+    try:
+        yield statements
+    finally:
+        _watchers.remove(statements)
+    if len(statements) > limit:
+        listing = '\n'.join(
+            f'{number}. {statement}'
+            for number, statement in enumerate(statements, start=1)
+        )
+        raise AssertionError(
+            f'{len(statements)} queries, expected at most {limit}:\n'
+            f'{listing}'
+        )
@@ -0,0 +1,284 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlencode
+
+import orjson
+from fastapi import Request, Response
+
+from services.cache import TTLCache
+from services.config import settings
+
+
+class CachedResponse:
+    """
+    Rendered JSON body of a GET together with its validator headers.
+    """
+
+    __slots__ = ('body', 'headers')
+
+    def __init__(self, body: bytes, headers: Dict[str, str]):
+        self.body = body
+        self.headers = headers
+
+    def response(self) -> Response:
+        return Response(
+            content=self.body,
+            media_type='application/json',
+            headers=self.headers,
+        )
+
+    def dumps(self) -> bytes:
+        # orjson never emits a raw newline, so it separates the two parts
+        return orjson.dumps(self.headers) + b'\n' + self.body
+
+    @classmethod
+    def loads(cls, raw: bytes) -> 'CachedResponse':
+        headers, body = raw.split(b'\n', 1)
+        return cls(body, orjson.loads(headers))
+
+
+def cache_key(request: Request, suffix: str = '') -> str:
+    """
+    One entry per route and query: the path carries the route and its path
+    parameters, the query string is normalised by sorting. `suffix` tells
+    apart responses that also depend on something outside the URL.
+    """
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f'{request.url.path}?{query}{suffix}'
+
+
+class CacheBackend:
+    """
+    Storage of cached responses, invalidated by tags.
+
+    Every tag has an epoch that moves on each invalidation. Readers take a
+    snapshot of the epochs before querying and `set` drops the entry if any
+    of them moved meanwhile, so a response built from data older than a
+    concurrent write is never stored after that write's invalidation.
+    """
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    def set(
+        self,
+        key: str,
+        value: CachedResponse,
+        tags: Iterable[str],
+        epochs: Tuple[int, ...],
+    ):
+        raise NotImplementedError
+
+    def epochs(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        raise NotImplementedError
+
+    def invalidate(self, tags: Iterable[str]):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+class NullCacheBackend(CacheBackend):
+    """
+    Caches nothing, every read goes to the database.
+    """
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return None
+
+    def set(self, key, value, tags, epochs):
+        pass
+
+    def epochs(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        return ()
+
+    def invalidate(self, tags: Iterable[str]):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 0}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Process local LRU with per entry expiry, the default backend.
+
+    Entries live in a TTLCache holding (response, tags); this class keeps
+    the tag index and the epochs. Its lock is held around every call to
+    the store, so the index updated by `on_drop` and the one updated here
+    never interleave.
+
+    Epochs come from one counter and at most `maxsize` tags keep their
+    own; the oldest are dropped first and a tag without one reads as the
+    newest dropped epoch. A tag invalidated after a snapshot therefore
+    reads higher than the snapshot whether or not its epoch was dropped.
+
+    Invalidation only reaches this process; run several workers against
+    the Redis backend instead.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize, ttl, on_drop=self._unindex)
+        self._keys_by_tag: Dict[str, set] = {}
+        # tag -> epoch, oldest first
+        self._epochs: Dict[str, int] = OrderedDict()
+        self._max_epochs = max(maxsize, 1)
+        self._clock = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    def set(self, key, value, tags, epochs):
+        tags = tuple(tags)
+        with self._lock:
+            if self._epochs_of(tags) != epochs:
+                return
+            self._entries.set(key, (value, tags))
+            if self._entries.maxsize <= 0:
+                return
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+    def epochs(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return self._epochs_of(tags)
+
+    def invalidate(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                self._clock += 1
+                self._epochs[tag] = self._clock
+                self._epochs.move_to_end(tag)
+                for key in self._keys_by_tag.pop(tag, ()):
+                    self._entries.delete(key)
+            while len(self._epochs) > self._max_epochs:
+                _, self._floor = self._epochs.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self) -> dict:
+        return self._entries.stats()
+
+    def _epochs_of(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._epochs.get(tag, self._floor) for tag in tags)
+
+    def _unindex(self, key: str, entry: Tuple[CachedResponse, tuple]):
+        for tag in entry[1]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend on any client with the redis-py `get`, `set(ex=)`,
+    `mget`, `sadd`, `smembers`, `expire`, `incr`, `delete` and `pipeline`
+    commands, e.g. redis-py itself or an in-process stand-in for tests.
+
+    The epoch check before `set` is not atomic with the write, the TTL
+    bounds the rare stale entry this lets through.
+    """
+
+    def __init__(self, client, ttl: float, prefix: str = 'response-cache:'):
+        self.client = client
+        self.ttl = max(1, int(ttl))
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float) -> 'RedisCacheBackend':
+        import redis
+
+        return cls(redis.Redis.from_url(url), ttl)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self.client.get(self._entry(key))
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if raw is None else CachedResponse.loads(raw)
+
+    def set(self, key, value, tags, epochs):
+        tags = tuple(tags)
+        if self.epochs(tags) != epochs:
+            return
+        pipe = self.client.pipeline()
+        pipe.set(self._entry(key), value.dumps(), ex=self.ttl)
+        for tag in tags:
+            pipe.sadd(self._tag(tag), key)
+            pipe.expire(self._tag(tag), self.ttl)
+        pipe.execute()
+
+    def epochs(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        tags = tuple(tags)
+        if not tags:
+            return ()
+        values = self.client.mget([self._epoch(tag) for tag in tags])
+        return tuple(int(value or 0) for value in values)
+
+    def invalidate(self, tags: Iterable[str]):
+        for tag in tags:
+            keys = self.client.smembers(self._tag(tag))
+            pipe = self.client.pipeline()
+            pipe.incr(self._epoch(tag))
+            if keys:
+                pipe.delete(*(self._entry(self._text(key)) for key in keys))
+            pipe.delete(self._tag(tag))
+            pipe.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter(f'{self.prefix}*'):
+            self.client.delete(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    @staticmethod
+    def _text(key) -> str:
+        return key.decode() if isinstance(key, bytes) else key
+
+    def _entry(self, key: str) -> str:
+        return f'{self.prefix}entry:{key}'
+
+    def _tag(self, tag: str) -> str:
+        return f'{self.prefix}tag:{tag}'
+
+    def _epoch(self, tag: str) -> str:
+        return f'{self.prefix}epoch:{tag}'
+
+
+def build_backend() -> CacheBackend:
+    if settings.response_cache_backend == 'redis':
+        return RedisCacheBackend.from_url(
+            settings.response_cache_url, settings.response_cache_ttl
+        )
+    if settings.response_cache_backend == 'memory':
+        return MemoryCacheBackend(
+            settings.response_cache_size, settings.response_cache_ttl
+        )
+    return NullCacheBackend()
+
+
+response_cache = build_backend()
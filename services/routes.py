@@ -0,0 +1,30 @@
+from typing import Callable, Dict
+
+UNMATCHED = '<unmatched>'
+# endpoint -> path template, filled the first time an endpoint is seen
+_templates: Dict[Callable, str] = {}
+
+
+def route_template(scope: dict) -> str:
+    """
+    Path template of the route that handled `scope`, e.g.
+    /api/v1/titles/{title_id}, or '<unmatched>' before or without a
+    match; raw paths would give every probed URL a name of its own.
+
+    Starlette leaves only the endpoint in the scope, the template is
+    looked up once per endpoint among the application's routes.
+    """
+    endpoint = scope.get('endpoint')
+    if endpoint is None:
+        return UNMATCHED
+    template = _templates.get(endpoint)
+    if template is None:
+        app = scope.get('app')
+        for route in getattr(app, 'routes', ()):
+            if getattr(route, 'endpoint', None) is endpoint:
+                template = route.path
+                break
+        else:
+            template = getattr(endpoint, '__name__', repr(endpoint))
+        _templates[endpoint] = template
+    return template
@@ -1,11 +1,13 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Optional, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
 from jose import jwt
-from passlib.context import CryptContext
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from config import (
@@ -14,20 +16,38 @@ from config import (
     JWT_REFRESH_SECRET_KEY,
     JWT_SECRET_KEY,
     REFRESH_TOKEN_EXPIRE_MINUTES,
+    settings,
 )
 from models import models
-from models.database import engine
-from schemas.user import TokenPayload, UserSerializer
-
-password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from models.async_db import get_db
+from models.database import get_session
+from schemas.user import TokenPayload, UserPrincipal
+from services.cache import TTLCache
+from services.hashing import HashingPoolBusy, PasswordHasher
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+hashing_busy_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many authentication requests, retry later.",
+    headers={"Retry-After": "1"},
+)
 
 
 def get_hashed_password(password: str) -> str:
-    return password_context.hash(password)
+    try:
+        return password_hasher.hash(password)
+    except HashingPoolBusy:
+        raise hashing_busy_exception
 
 
 def verify_password(password: str, hashed_pass: str) -> bool:
-    return password_context.verify(password, hashed_pass)
+    try:
+        return password_hasher.verify(password, hashed_pass)
+    except HashingPoolBusy:
+        raise hashing_busy_exception
 
 
 def create_access_token(token_payload: Any, expires_delta: int = None) -> str:
@@ -62,13 +82,66 @@ def create_refresh_token(
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/api/v1/login", scheme_name="JWT"
 )
-session = Session(bind=engine)
+user_cache = TTLCache(
+    maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl
+)
+token_cache = TTLCache(
+    maxsize=settings.token_cache_size, ttl=settings.token_cache_ttl
+)
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)) -> UserSerializer:
-    try:
+def decode_token(token: str) -> TokenPayload:
+    """
+    Verify the token signature and parse its payload.
+
+    Results are cached by token digest until the token expires, so repeated
+    bearer tokens skip the HMAC check and the pydantic validation.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    token_data = token_cache.get(key)
+    if token_data is None:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
         token_data = TokenPayload(**payload)
+        ttl = min(token_cache.ttl, token_data.exp - time.time())
+        if ttl > 0:
+            token_cache.set(key, token_data, ttl=ttl)
+    return token_data
+
+
+def cached_user(session: Session, user_id: int) -> Optional[UserPrincipal]:
+    """
+    Principal of `user_id`, from the cache or loaded into it. The
+    generation taken before the read keeps a row read before a concurrent
+    `patch_user` commit from being cached after its invalidation.
+    """
+    principal = user_cache.get(user_id)
+    if principal is None:
+        generation = user_cache.generation(user_id)
+        user = session.get(models.User, user_id)
+        if user is None:
+            return None
+        principal = UserPrincipal.from_orm(user)
+        user_cache.set(user_id, principal, generation=generation)
+    return principal
+
+
+async def cached_user_async(
+    session: AsyncSession, user_id: int
+) -> Optional[UserPrincipal]:
+    principal = user_cache.get(user_id)
+    if principal is None:
+        generation = user_cache.generation(user_id)
+        user = await session.get(models.User, user_id)
+        if user is None:
+            return None
+        principal = UserPrincipal.from_orm(user)
+        user_cache.set(user_id, principal, generation=generation)
+    return principal
+
+
+def current_token_payload(token: str) -> TokenPayload:
+    try:
+        token_data = decode_token(token)
 
         if datetime.fromtimestamp(token_data.exp) < datetime.now():
             raise HTTPException(
@@ -82,59 +155,96 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> UserSerializer:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return token_data
 
-    user: UserSerializer = session.get(models.User, token_data.id)
 
+def current_user_found(user: Optional[UserPrincipal]) -> UserPrincipal:
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Could not find user",
         )
-
     return user
 
 
-def get_allowed_user(
-    security_scopes: SecurityScopes, token: str = Depends(oauth2_scheme)
-) -> models.User:
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: Session = Depends(get_session),
+) -> UserPrincipal:
+    token_data = current_token_payload(token)
+    return current_user_found(cached_user(session, token_data.id))
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_db),
+) -> UserPrincipal:
+    token_data = current_token_payload(token)
+    return current_user_found(
+        await cached_user_async(session, token_data.id)
+    )
+
+
+def authenticate_value(security_scopes: SecurityScopes) -> str:
     if security_scopes.scopes:
-        authenticate_value = f'Bearer scope="{security_scopes.scope_str}"'
-    else:
-        authenticate_value = "Bearer"
-    credentials_exception = HTTPException(
+        return f'Bearer scope="{security_scopes.scope_str}"'
+    return "Bearer"
+
+
+def credentials_exception(security_scopes: SecurityScopes) -> HTTPException:
+    return HTTPException(
         status_code=401,
         detail="Could not validate credentials",
-        headers={"WWW-Authenticate": authenticate_value},
+        headers={"WWW-Authenticate": authenticate_value(security_scopes)},
     )
-    try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
 
-        if payload.get("id") is None:
-            raise credentials_exception
-        token_data = TokenPayload(**payload)
+
+def allowed_token_payload(
+    security_scopes: SecurityScopes, token: str
+) -> TokenPayload:
+    try:
+        token_data = decode_token(token)
     except (jwt.JWTError, ValidationError):
-        
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user: UserSerializer = session.get(models.User, token_data.id)
-    
+    return token_data
+
+
+def allowed_user_found(
+    security_scopes: SecurityScopes,
+    token_data: TokenPayload,
+    user: Optional[UserPrincipal],
+) -> UserPrincipal:
     if not user:
-        raise credentials_exception
-    if security_scopes.scopes and not token_data.role:
-        raise HTTPException(
-            status_code=401,
-            detail="Not enough permissions",
-            headers={"WWW-Authenticate": authenticate_value},
-        )
-    if (
-        security_scopes.scopes
-        and token_data.role not in security_scopes.scopes
+        raise credentials_exception(security_scopes)
+    if security_scopes.scopes and (
+        not token_data.role or token_data.role not in security_scopes.scopes
     ):
         raise HTTPException(
             status_code=401,
             detail="Not enough permissions",
-            headers={"WWW-Authenticate": authenticate_value},
+            headers={"WWW-Authenticate": authenticate_value(security_scopes)},
         )
     return user
+
+
+def get_allowed_user(
+    security_scopes: SecurityScopes,
+    token: str = Depends(oauth2_scheme),
+    session: Session = Depends(get_session),
+) -> UserPrincipal:
+    token_data = allowed_token_payload(security_scopes, token)
+    user = cached_user(session, token_data.id)
+    return allowed_user_found(security_scopes, token_data, user)
+
+
+async def get_allowed_user_async(
+    security_scopes: SecurityScopes,
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_db),
+) -> UserPrincipal:
+    token_data = allowed_token_payload(security_scopes, token)
+    user = await cached_user_async(session, token_data.id)
+    return allowed_user_found(security_scopes, token_data, user)